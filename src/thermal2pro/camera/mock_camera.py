@@ -1,69 +1,205 @@
 import numpy as np
 import cv2
 import time
-from threading import Lock
 from typing import Tuple, Optional
 
+try:
+    from numba import njit, prange
+except ImportError:  # Numba is optional; the NumPy path is used without it
+    njit = None
+
+if njit is not None:
+    @njit(fastmath=True, parallel=True, cache=True)
+    def _synthesize_pattern(out, sx, cx, sy, cy, sp, cp, noise):
+        """Fused pattern + noise + saturation kernel writing uint8 output."""
+        for i in prange(out.shape[0]):
+            row = (cy[i] * cp + sy[i] * sp) * 128
+            for j in range(out.shape[1]):
+                v = (sx[j] * cp + cx[j] * sp) * 128 + row + noise[i, j]
+                if v < 0:
+                    out[i, j] = 0
+                elif v > 255:
+                    out[i, j] = 255
+                else:
+                    out[i, j] = np.uint8(v)
+else:
+    _synthesize_pattern = None
+
 class MockThermalCamera:
-    """Mock thermal camera for testing and development."""
+    """Mock thermal camera for testing and development.
+    
+    By default frames are BGR like cv2.VideoCapture. With grayscale=True
+    the single-channel pattern is returned directly (hot spot as full
+    intensity), skipping the 3-channel expansion for consumers that only
+    need intensity.
+    """
     
-    def __init__(self, width: int = 256, height: int = 192):
+    def __init__(self, width: int = 256, height: int = 192, grayscale: bool = False):
         self.width = width
         self.height = height
+        self.grayscale = grayscale
         self.is_open = True
-        self._lock = Lock()
         self._frame_count = 0
-        self._last_frame_time = time.time()
+        self._frame_period_ns = 33_333_333  # Cap at 30 FPS
+        self._min_sleep_ns = 1_000_000  # Shorter sleeps are not worth a syscall
+        self._next_deadline = time.monotonic_ns()
+        
+        # Create test pattern basis. The pattern is separable in x and y, so
+        # keep 1D sin/cos vectors shaped for broadcasting instead of a full grid.
+        x = np.arange(width) * (255.0 / max(width - 1, 1))
+        y = np.arange(height) * (255.0 / max(height - 1, 1))
+        self.sx = np.sin(x / 32)[None, :]
+        self.cx = np.cos(x / 32)[None, :]
+        self.sy = np.sin(y / 32)[:, None]
+        self.cy = np.cos(y / 32)[:, None]
+        
+        # Noise generator and reusable output buffer
+        self._rng = np.random.default_rng()
+        self._noise_buf = np.empty((height, width), dtype=np.float32)
+        # Intermediate grayscale buffer for the JIT kernel in BGR mode
+        self._gray_buf = np.empty((height, width), dtype=np.uint8)
         
-        # Create test pattern
-        x = np.linspace(0, 255, width)
-        y = np.linspace(0, 255, height)
-        self.xx, self.yy = np.meshgrid(x, y)
+        # Double-buffered output frames: read() fills the back buffer
+        # and flips, so the previously returned frame stays intact
+        frame_shape = (height, width) if grayscale else (height, width, 3)
+        self._frame_buffers = (
+            np.empty(frame_shape, dtype=np.uint8),
+            np.empty(frame_shape, dtype=np.uint8),
+        )
+        self._write_idx = 0
         
-    def read(self) -> Tuple[bool, Optional[np.ndarray]]:
+        # Precomputed hot spot disc, blitted with a boolean mask each frame
+        self._hot_radius = 10
+        size = 2 * self._hot_radius + 1
+        disc = np.zeros((size, size), dtype=np.uint8)
+        cv2.circle(disc, (self._hot_radius, self._hot_radius), self._hot_radius, 255, -1)
+        self._hot_mask = disc.astype(bool)
+        
+    def read(self, image: Optional[np.ndarray] = None) -> Tuple[bool, Optional[np.ndarray]]:
         """Simulate reading a frame from the camera.
         
+        Equivalent to grab() followed by retrieve(image), as with
+        cv2.VideoCapture.
+        
+        Args:
+            image: Optional uint8 output array to write the frame into
+            
         Returns:
             Tuple of (success, frame)
         """
-        if not self.is_open:
+        if not self.grab():
             return False, None
+        return self.retrieve(image)
+        
+    def grab(self) -> bool:
+        """Wait for the next frame slot without producing the frame.
+        
+        Returns:
+            True if the camera is open
+        """
+        if not self.is_open:
+            return False
             
-        with self._lock:
-            # Create animated test pattern
-            t = time.time()
-            phase = (t * 2) % (2 * np.pi)
-            
-            # Generate simulated thermal pattern
-            pattern = (
-                np.sin(self.xx / 32 + phase) * 128 + 
-                np.cos(self.yy / 32 - phase) * 128
-            ).astype(np.uint8)
+        # Simulate frame timing against a fixed deadline so the rate
+        # does not drift; if we fall behind, restart the schedule from now
+        now = time.monotonic_ns()
+        wait = self._next_deadline - now
+        if wait > self._min_sleep_ns:
+            time.sleep(wait / 1e9)
+        self._next_deadline = max(self._next_deadline, now) + self._frame_period_ns
+        return True
+        
+    def retrieve(self, image: Optional[np.ndarray] = None) -> Tuple[bool, Optional[np.ndarray]]:
+        """Produce the frame for the last grab().
+        
+        Frames are written into two alternating buffers, so a returned frame
+        remains valid until the read after next. The returned array is
+        read-only to avoid defensive copies; callers must copy it before
+        drawing on it or keeping it longer. Frames are meant to be read
+        from a single producer thread.
+        
+        Like cv2.VideoCapture.retrieve, a caller-owned array of the right
+        shape may be passed as image to receive the frame instead.
+        
+        Args:
+            image: Optional uint8 output array to write the frame into
             
-            # Add some noise
-            noise = np.random.normal(0, 5, pattern.shape).astype(np.uint8)
-            pattern = cv2.add(pattern, noise)
+        Returns:
+            Tuple of (success, frame)
+        """
+        if not self.is_open:
+            return False, None
             
+        # Create animated test pattern
+        t = time.monotonic()
+        phase = (t * 2) % (2 * np.pi)
+        
+        sp = np.sin(phase)
+        cp = np.cos(phase)
+        
+        # Noise is added to the pattern before saturating to uint8
+        self._rng.standard_normal(dtype=np.float32, out=self._noise_buf)
+        self._noise_buf *= 5.0
+        
+        own_buffer = not self._is_external_buffer(image)
+        if own_buffer:
+            frame = self._frame_buffers[self._write_idx]
+            self._write_idx ^= 1
+            frame.flags.writeable = True
+        else:
+            frame = image
+        gray = frame if self.grayscale else self._gray_buf
+        
+        if _synthesize_pattern is not None:
+            _synthesize_pattern(gray, self.sx[0], self.cx[0], self.sy[:, 0], self.cy[:, 0],
+                                sp, cp, self._noise_buf)
+        else:
+            # Generate simulated thermal pattern using sum-of-angles:
+            # sin(x + p) = sin(x)cos(p) + cos(x)sin(p)
+            # cos(y - p) = cos(y)cos(p) + sin(y)sin(p)
+            pattern = (
+                (self.sx * cp + self.cx * sp) * 128 +
+                (self.cy * cp + self.sy * sp) * 128
+            )
+            pattern += self._noise_buf
+            np.clip(pattern, 0, 255, out=pattern)
+            np.copyto(gray, pattern, casting='unsafe')
+        
+        if self.grayscale:
+            hot_value = 255
+        else:
             # Create BGR frame
-            frame = cv2.cvtColor(pattern, cv2.COLOR_GRAY2BGR)
-            
-            # Add simulated hot spots
-            hot_spots = [
-                (int(self.width/2 + np.sin(t) * 50), 
-                 int(self.height/2 + np.cos(t) * 30))
-            ]
-            for x, y in hot_spots:
-                cv2.circle(frame, (x, y), 10, (0, 0, 255), -1)
-            
-            # Simulate frame timing
-            current_time = time.time()
-            elapsed = current_time - self._last_frame_time
-            if elapsed < 1/30:  # Cap at 30 FPS
-                time.sleep(1/30 - elapsed)
-            self._last_frame_time = time.time()
-            
-            self._frame_count += 1
-            return True, frame
+            cv2.cvtColor(gray, cv2.COLOR_GRAY2BGR, dst=frame)
+            hot_value = (0, 0, 255)
+        
+        # Add simulated hot spot
+        x = int(self.width/2 + np.sin(t) * 50)
+        y = int(self.height/2 + np.cos(t) * 30)
+        self._draw_hot_spot(frame, x, y, hot_value)
+        if own_buffer:
+            frame.flags.writeable = False
+        
+        self._frame_count += 1
+        return True, frame
+        
+    def _is_external_buffer(self, image: Optional[np.ndarray]) -> bool:
+        """Check whether image is a usable caller-owned output array."""
+        if image is None or any(image is buf for buf in self._frame_buffers):
+            return False
+        return (image.shape == self._frame_buffers[0].shape and image.dtype == np.uint8
+                and image.flags.c_contiguous and image.flags.writeable)
+        
+    def _draw_hot_spot(self, frame: np.ndarray, x: int, y: int, value):
+        """Paint the precomputed hot spot disc centred at (x, y), clipped to the frame."""
+        r = self._hot_radius
+        x0, y0 = x - r, y - r
+        left, top = max(x0, 0), max(y0, 0)
+        right = min(x0 + self._hot_mask.shape[1], frame.shape[1])
+        bottom = min(y0 + self._hot_mask.shape[0], frame.shape[0])
+        if left >= right or top >= bottom:
+            return
+        mask = self._hot_mask[top - y0:bottom - y0, left - x0:right - x0]
+        frame[top:bottom, left:right][mask] = value
             
     def release(self):
         """Release the mock camera."""
@@ -1,6 +1,136 @@
 import numpy as np
 import cv2
 
+try:
+    from numba import njit, prange
+except ImportError:  # Numba is optional; apply_lut falls back to np.take
+    njit = None
+
+if njit is not None:
+    @njit(fastmath=True, parallel=True, cache=True)
+    def _gather_lut(src, lut, out):
+        """Single-pass gather of lut rows indexed by a uint8 image."""
+        for i in prange(src.shape[0]):
+            for j in range(src.shape[1]):
+                entry = lut[src[i, j]]
+                for c in range(out.shape[2]):
+                    out[i, j, c] = entry[c]
+                    
+    @njit(fastmath=True, parallel=True, cache=True)
+    def _gather_words(src, words, out):
+        """Single-pass gather of packed 32-bit pixels indexed by an image."""
+        for i in prange(src.shape[0]):
+            for j in range(src.shape[1]):
+                out[i, j] = words[src[i, j]]
+else:
+    _gather_lut = None
+    _gather_words = None
+
+def apply_lut(gray, lut, out):
+    """Map a 2D uint8/uint16 image through an (N, C) table into out (H, W, C).
+    
+    Uses a parallel JIT kernel when Numba is installed, otherwise np.take.
+    Contiguous 4-channel uint8 tables (BGRA) are gathered as whole 32-bit
+    pixels rather than channel by channel.
+    
+    Returns:
+        out
+    """
+    if (lut.dtype == np.uint8 and lut.shape[1] == 4
+            and lut.flags.c_contiguous and out.flags.c_contiguous):
+        words = lut.view(np.uint32).reshape(-1)
+        out_words = out.view(np.uint32).reshape(out.shape[:2])
+        if _gather_words is not None:
+            _gather_words(gray, words, out_words)
+        else:
+            # mode='clip' lets np.take write straight into out_words; the
+            # default 'raise' mode gathers into a temporary first
+            np.take(words, gray, out=out_words, mode='clip')
+    elif _gather_lut is not None:
+        _gather_lut(gray, lut, out)
+    else:
+        np.take(lut, gray, axis=0, out=out, mode='clip')
+    return out
+
+def build_rgb_lut(colormap):
+    """Build a (256, 3) RGB lookup table for an OpenCV colormap."""
+    gray_ramp = np.arange(256, dtype=np.uint8).reshape(1, 256)
+    colored = cv2.applyColorMap(gray_ramp, colormap)
+    return cv2.cvtColor(colored, cv2.COLOR_BGR2RGB).reshape(256, 3)
+
+def build_bgra_lut(colormap):
+    """Build a (256, 4) opaque BGRA lookup table for an OpenCV colormap.
+    
+    BGRA matches Cairo's ARGB32 memory layout on little-endian hosts.
+    """
+    gray_ramp = np.arange(256, dtype=np.uint8).reshape(1, 256)
+    colored = cv2.applyColorMap(gray_ramp, colormap)
+    return cv2.cvtColor(colored, cv2.COLOR_BGR2BGRA).reshape(256, 4)
+
+class RawNormalizer:
+    """Quantize 16-bit raw sensor frames to uint8 for display.
+    
+    The display range follows each frame's min/max through an exponential
+    moving average. Frames are mapped through a 65536-entry lookup table,
+    which is only rebuilt once that range has moved by at least one output
+    level.
+    """
+    
+    def __init__(self, smoothing=0.1):
+        """Initialize the normalizer.
+        
+        Args:
+            smoothing: Weight of the newest frame in the min/max averages
+        """
+        self.smoothing = smoothing
+        self._lo = None
+        self._hi = None
+        self._lut = np.empty(65536, dtype=np.uint8)
+        self._lut_range = None
+        # Incremented whenever the table is rebuilt
+        self.version = 0
+        
+    @property
+    def lut(self):
+        """The current raw-to-uint8 table, indexed by raw value."""
+        return self._lut
+        
+    def __call__(self, frame, out=None):
+        """Map a uint16 frame to uint8, writing into out when given."""
+        self.update(frame)
+        if out is None:
+            out = np.empty(frame.shape, dtype=np.uint8)
+        np.take(self._lut, frame, out=out, mode='clip')
+        return out
+        
+    def update(self, frame):
+        """Fold a frame's range into the averages, rebuilding the table if needed."""
+        if frame is None or not isinstance(frame, np.ndarray) or frame.dtype != np.uint16:
+            raise ValueError("Frame must be a uint16 array")
+            
+        lo, hi = float(frame.min()), float(frame.max())
+        if self._lo is None:
+            self._lo, self._hi = lo, hi
+        else:
+            a = self.smoothing
+            self._lo += a * (lo - self._lo)
+            self._hi += a * (hi - self._hi)
+            
+        span = max(self._hi - self._lo, 1.0)
+        if (self._lut_range is None or
+                abs(self._lo - self._lut_range[0]) * 255 >= span or
+                abs(self._hi - self._lut_range[1]) * 255 >= span):
+            self._build_lut(self._lo, span)
+            self._lut_range = (self._lo, self._hi)
+            self.version += 1
+        
+    def _build_lut(self, lo, span):
+        levels = np.arange(65536, dtype=np.float32)
+        levels -= np.float32(lo)
+        levels *= np.float32(255.0 / span)
+        np.clip(levels, 0, 255, out=levels)
+        np.copyto(self._lut, levels, casting='unsafe')
+
 class ThermalProcessor:
     PALETTE_MAP = {
         'iron': cv2.COLORMAP_HOT,
@@ -8,6 +138,18 @@ class ThermalProcessor:
         'gray': cv2.COLORMAP_BONE
     }
     
+    # Precomputed RGB lookup tables, one per palette
+    RGB_LUTS = {name: build_rgb_lut(cmap) for name, cmap in PALETTE_MAP.items()}
+    
+    def __init__(self, fast_denoise=True):
+        """Initialize the processor.
+        
+        Args:
+            fast_denoise: Use a separable Gaussian blur for preprocessing
+                instead of the slower edge-preserving bilateral filter
+        """
+        self.fast_denoise = fast_denoise
+    
     def apply_palette(self, frame, palette_name):
         """Apply color palette to grayscale frame."""
         if palette_name not in self.PALETTE_MAP:
@@ -16,11 +158,20 @@ class ThermalProcessor:
         if frame is None or not isinstance(frame, np.ndarray):
             raise ValueError("Invalid frame")
             
+        if frame.ndim == 2 and frame.dtype == np.uint8:
+            # Single indexing pass through the precomputed RGB table
+            return self.RGB_LUTS[palette_name][frame]
+            
         colored = cv2.applyColorMap(frame, self.PALETTE_MAP[palette_name])
         return cv2.cvtColor(colored, cv2.COLOR_BGR2RGB)
     
-    def scale_frame(self, frame, target_width, target_height):
-        """Scale frame while preserving aspect ratio."""
+    def scale_frame(self, frame, target_width, target_height, interp=None):
+        """Scale frame while preserving aspect ratio.
+        
+        Uses INTER_AREA when shrinking and INTER_LINEAR when enlarging unless
+        an explicit interpolation flag is given. Returns the input unchanged
+        when no resize is needed.
+        """
         if frame is None or not isinstance(frame, np.ndarray):
             raise ValueError("Invalid frame")
             
@@ -36,22 +187,47 @@ class ThermalProcessor:
             new_height = target_height
             new_width = int(target_height * src_aspect)
             
-        return cv2.resize(frame, (new_width, new_height), interpolation=cv2.INTER_LINEAR)
+        if new_width == frame.shape[1] and new_height == frame.shape[0]:
+            return frame
+            
+        if interp is None:
+            interp = cv2.INTER_AREA if new_width < frame.shape[1] else cv2.INTER_LINEAR
+            
+        return cv2.resize(frame, (new_width, new_height), interpolation=interp)
     
     def map_temperature_range(self, frame, min_temp, max_temp):
         """Map raw values to temperature range."""
         if frame is None or not isinstance(frame, np.ndarray):
             raise ValueError("Invalid frame")
             
-        # Linear mapping from raw values to temperature
-        temp_frame = self.raw_to_temperature(frame, min_temp, max_temp)
-        # Normalize back to 0-255 for display
-        normalized = ((temp_frame - min_temp) * 255 / (max_temp - min_temp)).astype(np.uint8)
-        return normalized
+        # Mapping raw values to [min_temp, max_temp] and normalizing back to
+        # 0-255 for display is the identity on raw values, so skip the float
+        # intermediates and convert straight to uint8 in a single pass.
+        if frame.dtype == np.uint8:
+            return frame.copy()
+        return cv2.convertScaleAbs(frame)
     
     def raw_to_temperature(self, raw_value, min_temp, max_temp):
-        """Convert raw sensor value to temperature."""
-        return min_temp + (raw_value / 255.0) * (max_temp - min_temp)
+        """Convert raw sensor value to temperature.
+        
+        Arrays are converted in float32; uint8 frames go through a 256-entry
+        lookup table instead of per-pixel arithmetic.
+        """
+        if not isinstance(raw_value, np.ndarray):
+            return min_temp + (raw_value / 255.0) * (max_temp - min_temp)
+            
+        scale = np.float32((max_temp - min_temp) / 255.0)
+        offset = np.float32(min_temp)
+        if raw_value.dtype == np.uint8:
+            lut = np.arange(256, dtype=np.float32)
+            lut *= scale
+            lut += offset
+            return lut[raw_value]
+            
+        out = raw_value.astype(np.float32)
+        np.multiply(out, scale, out=out)
+        np.add(out, offset, out=out)
+        return out
     
     def preprocess_frame(self, frame):
         """Apply preprocessing to raw frame."""
@@ -61,6 +237,10 @@ class ThermalProcessor:
         if len(frame.shape) != 2:
             raise ValueError("Frame must be grayscale (single channel)")
             
+        if self.fast_denoise:
+            # Separable Gaussian blur, O(W*H) and much cheaper than bilateral
+            return cv2.GaussianBlur(frame, (5, 5), 0)
+            
         # Apply bilateral filter for noise reduction while preserving edges
         denoised = cv2.bilateralFilter(frame, 5, 75, 75)
         return denoised
@@ -13,23 +13,48 @@ logging.basicConfig(
 )
 logger = logging.getLogger(__name__)
 
-# Set GTK version based on environment or default to 3.0
-GTK_VERSION = os.environ.get('GTK_VERSION', '3.0')
-try:
-    gi.require_version('Gtk', GTK_VERSION)
-    logger.info(f"Using GTK {GTK_VERSION}")
-except ValueError as e:
-    logger.warning(f"Failed to use GTK {GTK_VERSION}, falling back to GTK 3.0")
-    gi.require_version('Gtk', '3.0')
+def _select_gtk_version():
+    """Pick the GTK version once, reusing any version already required."""
+    required = gi.get_required_version('Gtk')
+    if required:
+        return required
+        
+    # Set GTK version based on environment or default to 3.0
+    version = os.environ.get('GTK_VERSION', '3.0')
+    try:
+        gi.require_version('Gtk', version)
+        logger.info(f"Using GTK {version}")
+    except ValueError as e:
+        logger.warning(f"Failed to use GTK {version}, falling back to GTK 3.0")
+        version = '3.0'
+        gi.require_version('Gtk', version)
+    return version
+
+GTK_VERSION = _select_gtk_version()
+
+# GTK4's older default GL renderer is slow on ARM; prefer the newer one
+# unless the user chose a renderer
+os.environ.setdefault('GSK_RENDERER', 'ngl')
 
 from gi.repository import Gtk
-from thermal2pro.ui.window import ThermalWindow
 
 def signal_handler(signum, frame):
     """Handle system signals gracefully."""
     logger.info(f"Received signal {signum}. Shutting down gracefully...")
     sys.exit(0)
 
+_signal_handlers_installed = False
+
+def install_signal_handlers():
+    """Register SIGINT/SIGTERM handlers, at most once per process."""
+    global _signal_handlers_installed
+    if _signal_handlers_installed:
+        return
+    signal.signal(signal.SIGINT, signal_handler)
+    signal.signal(signal.SIGTERM, signal_handler)
+    _signal_handlers_installed = True
+    logger.info("Signal handlers set up successfully")
+
 class ThermalApp(Gtk.Application):
     def __init__(self, use_mock_camera=False):
         super().__init__()
@@ -41,13 +66,14 @@ class ThermalApp(Gtk.Application):
         Gtk.Application.do_startup(self)
         
         # Set up signal handlers
-        signal.signal(signal.SIGINT, signal_handler)
-        signal.signal(signal.SIGTERM, signal_handler)
-        logger.info("Signal handlers set up successfully")
+        install_signal_handlers()
 
     def do_activate(self):
         """Handle application activation."""
         try:
+            # Imported here so cv2/numpy load after GTK is up rather than
+            # delaying process startup
+            from thermal2pro.ui.window import ThermalWindow
             win = ThermalWindow(self, use_mock_camera=self.use_mock_camera)
             win.present()
             logger.info("Window presented")
@@ -55,6 +81,10 @@ class ThermalApp(Gtk.Application):
             logger.error(f"Error activating window: {e}")
             self.quit()
 
+def create_app(use_mock=False):
+    """Create the application without parsing command line arguments."""
+    return ThermalApp(use_mock_camera=use_mock)
+
 def main():
     """Main entry point."""
     parser = argparse.ArgumentParser(description='Thermal2Pro Camera Application')
@@ -65,7 +95,7 @@ def main():
         logger.info("Starting in mock camera mode")
 
     try:
-        app = ThermalApp(use_mock_camera=args.mock)
+        app = create_app(use_mock=args.mock)
         logger.info("Application startup completed")
         exit_status = app.run(None)
         logger.info("Application shutdown completed")
@@ -1,12 +1,48 @@
 import os
+import time
 import shutil
 import logging
+from operator import itemgetter
 from datetime import datetime, timedelta
 from pathlib import Path
-from typing import List, Dict, Optional
+from typing import List, Dict, Optional, Set, Tuple
 
 logger = logging.getLogger(__name__)
 
+CAPTURE_TIMESTAMP_FORMAT = "%Y%m%d_%H%M%S"
+
+def format_capture_timestamp(seconds: float) -> str:
+    """Format a time.time() value as a local capture timestamp.
+    
+    Produces the same string as time.strftime(CAPTURE_TIMESTAMP_FORMAT, ...),
+    but an f-string avoids strftime's format parsing on every capture.
+    """
+    lt = time.localtime(seconds)
+    return (f"{lt.tm_year:04d}{lt.tm_mon:02d}{lt.tm_mday:02d}_"
+            f"{lt.tm_hour:02d}{lt.tm_min:02d}{lt.tm_sec:02d}")
+
+def _parse_capture_timestamp(ts: str) -> datetime:
+    """Parse a YYYYMMDD_HHMMSS capture timestamp.
+    
+    Equivalent to datetime.strptime(ts, CAPTURE_TIMESTAMP_FORMAT) for this
+    fixed layout, but much cheaper.
+    
+    Raises:
+        ValueError: If the string does not match the expected layout
+    """
+    if len(ts) != 15 or ts[8] != "_" or not (ts[:8].isdigit() and ts[9:].isdigit()):
+        raise ValueError(f"Invalid capture timestamp: {ts}")
+    return datetime(int(ts[0:4]), int(ts[4:6]), int(ts[6:8]),
+                    int(ts[9:11]), int(ts[11:13]), int(ts[13:15]))
+
+# Re-check free space during cleanup only after this much has been freed
+SPACE_RECHECK_BYTES = 256 * 2**20
+# Coarsest directory mtime resolution expected (FAT/exFAT USB drives)
+MTIME_GRANULARITY_NS = 2 * 10**9
+
+# Storage directories already created by any handler in this process
+_ENSURED_PATHS: Set[str] = set()
+
 class StorageHandler:
     """Handles storage management for thermal captures including cleanup and monitoring.
     
@@ -26,10 +62,39 @@ class StorageHandler:
         self.fallback_storage = "/home/pi/thermal_captures"
         self.max_age_days = max_age_days
         self.min_free_space_gb = min_free_space_gb
+        # Resolved storage path is cached briefly to avoid repeated mount
+        # and access checks when capturing in bursts
+        self._storage_path_cache: Optional[str] = None
+        self._storage_path_expiry = 0.0
+        self._storage_ttl_s = 2.0
+        # Capture timestamps only change once per second
+        self._timestamp_second: Optional[int] = None
+        self._timestamp_str = ""
+        # Parsed capture listing, valid while the directory mtime is unchanged:
+        # (storage path, directory mtime_ns, scan time_ns, [(timestamp, path), ...])
+        self._captures_cache: Optional[Tuple[str, int, int, List[Tuple[datetime, str]]]] = None
+        # (checked_at, mounted) for the USB mount check
+        self._mount_cache: Optional[Tuple[float, bool]] = None
+        self._mount_ttl_s = 1.0
         self._ensure_storage_paths()
         
     def _is_usb_mounted(self) -> bool:
-        """Check if the USB drive is properly mounted."""
+        """Check if the USB drive is properly mounted.
+        
+        The result is cached for a short TTL since this is consulted by most
+        storage operations.
+        """
+        now = time.monotonic()
+        cache = self._mount_cache
+        if cache and now - cache[0] < self._mount_ttl_s:
+            return cache[1]
+            
+        mounted = self._check_usb_mount()
+        self._mount_cache = (now, mounted)
+        return mounted
+        
+    def _check_usb_mount(self) -> bool:
+        """Check the mount point and verify the device against /proc/mounts."""
         try:
             # Check if mount point exists and is mounted
             if not os.path.ismount("/media/usb0"):
@@ -44,25 +109,46 @@ class StorageHandler:
             return False
     
     def _ensure_storage_paths(self):
-        """Create storage directories if they don't exist."""
-        try:
-            Path(self.primary_storage).mkdir(parents=True, exist_ok=True)
-            logger.info(f"Ensured primary storage at {self.primary_storage}")
-        except Exception as e:
-            logger.error(f"Failed to create primary storage: {e}")
+        """Create storage directories if they don't exist.
+        
+        Paths already ensured earlier in this process are skipped.
+        """
+        if self.primary_storage not in _ENSURED_PATHS:
+            try:
+                Path(self.primary_storage).mkdir(parents=True, exist_ok=True)
+                _ENSURED_PATHS.add(self.primary_storage)
+                logger.info(f"Ensured primary storage at {self.primary_storage}")
+            except Exception as e:
+                logger.error(f"Failed to create primary storage: {e}")
             
-        try:
-            Path(self.fallback_storage).mkdir(parents=True, exist_ok=True)
-            logger.info(f"Ensured fallback storage at {self.fallback_storage}")
-        except Exception as e:
-            logger.error(f"Failed to create fallback storage: {e}")
+        if self.fallback_storage not in _ENSURED_PATHS:
+            try:
+                Path(self.fallback_storage).mkdir(parents=True, exist_ok=True)
+                _ENSURED_PATHS.add(self.fallback_storage)
+                logger.info(f"Ensured fallback storage at {self.fallback_storage}")
+            except Exception as e:
+                logger.error(f"Failed to create fallback storage: {e}")
         
     def get_storage_path(self) -> str:
         """Get the current storage path, preferring USB storage when available.
         
+        The result is cached for a short TTL so bursts of captures do not
+        repeat the mount and access checks.
+        
         Returns:
             str: Path to the current storage location
         """
+        now = time.monotonic()
+        if self._storage_path_cache and now < self._storage_path_expiry:
+            return self._storage_path_cache
+            
+        storage = self._resolve_storage_path()
+        self._storage_path_cache = storage
+        self._storage_path_expiry = now + self._storage_ttl_s
+        return storage
+        
+    def _resolve_storage_path(self) -> str:
+        """Check mounts and permissions to pick the storage location."""
         if self._is_usb_mounted() and os.access(self.primary_storage, os.W_OK):
             logger.info("Using USB storage for captures")
             return self.primary_storage
@@ -73,10 +159,18 @@ class StorageHandler:
             
         return self.fallback_storage
         
+    def invalidate_storage_path(self):
+        """Force the next get_storage_path call to re-check storage."""
+        self._storage_path_cache = None
+        self._mount_cache = None
+        
     def get_capture_path(self, prefix="thermal"):
         storage = self.get_storage_path()
-        timestamp = datetime.now().strftime("%Y%m%d_%H%M%S")
-        return str(Path(storage) / f"{prefix}_{timestamp}.jpg")
+        second = int(time.time())
+        if second != self._timestamp_second:
+            self._timestamp_second = second
+            self._timestamp_str = format_capture_timestamp(second)
+        return str(Path(storage) / f"{prefix}_{self._timestamp_str}.jpg")
         
     def get_storage_info(self) -> Optional[Dict[str, any]]:
         """Get information about the current storage location.
@@ -104,30 +198,74 @@ class StorageHandler:
             
         except OSError as e:
             logger.error(f"Failed to get storage info for {storage}: {e}")
+            # The cached location may have gone away (e.g. USB unplugged)
+            self.invalidate_storage_path()
             return None
             
-    def list_captures(self) -> List[Dict[str, str]]:
-        """List all captures with their timestamps and paths."""
+    def list_captures(self) -> List[Dict[str, any]]:
+        """List all captures with their timestamps and paths, newest first.
+        
+        Timestamps are datetime objects; call isoformat() where a string is
+        needed.
+        """
         storage = self.get_storage_path()
-        captures = []
         try:
-            for file in Path(storage).glob("thermal_*.jpg"):
-                timestamp_str = file.stem.split("_", 1)[1]  # Remove 'thermal_' prefix
+            entries = self._scan_captures(storage)
+        except OSError:
+            self.invalidate_storage_path()
+            return []
+            
+        now = datetime.now()
+        return [
+            {
+                "path": path,
+                "timestamp": timestamp,
+                "age_days": (now - timestamp).days
+            }
+            for timestamp, path in entries
+        ]
+        
+    def _scan_captures(self, storage: str) -> List[Tuple[datetime, str]]:
+        """Return parsed capture entries, rescanning only if the directory changed.
+        
+        Directory mtimes are coarse on some filesystems, so a file added
+        shortly after a scan may leave the mtime unchanged. Like git's racy
+        index check, a listing is only reused if the directory was last
+        modified well before the scan.
+        """
+        dir_mtime = os.stat(storage).st_mtime_ns
+        cache = self._captures_cache
+        if (cache and cache[0] == storage and cache[1] == dir_mtime
+                and cache[2] - dir_mtime >= MTIME_GRANULARITY_NS):
+            return cache[3]
+            
+        scanned_at = time.time_ns()
+        entries = []
+        parse = _parse_capture_timestamp
+        with os.scandir(storage) as it:
+            for entry in it:
+                name = entry.name
+                if not (name.startswith("thermal_") and name.endswith(".jpg")):
+                    continue
+                timestamp_str = name[8:-4]  # Strip 'thermal_' prefix and '.jpg'
                 try:
-                    timestamp = datetime.strptime(timestamp_str, "%Y%m%d_%H%M%S")
-                    captures.append({
-                        "path": str(file),
-                        "timestamp": timestamp.isoformat(),
-                        "age_days": (datetime.now() - timestamp).days
-                    })
+                    timestamp = parse(timestamp_str)
                 except ValueError:
                     continue  # Skip files that don't match expected format
-        except OSError:
-            return []
-        return sorted(captures, key=lambda x: x["timestamp"], reverse=True)
+                entries.append((timestamp, entry.path))
+                
+        # Sort once on the parsed datetimes rather than on formatted strings
+        entries.sort(key=itemgetter(0), reverse=True)
+        self._captures_cache = (storage, dir_mtime, scanned_at, entries)
+        return entries
     
-    def cleanup_old_captures(self) -> Dict[str, int]:
-        """Clean up old captures based on age and space constraints."""
+    def cleanup_old_captures(self, captures: Optional[List[Dict[str, any]]] = None) -> Dict[str, int]:
+        """Clean up old captures based on age and space constraints.
+        
+        Args:
+            captures: Capture listing to work from, sorted newest first as
+                returned by list_captures(); listed fresh when not given
+        """
         result = {"deleted": 0, "freed_space": 0}
         storage = self.get_storage_path()
         
@@ -136,24 +274,65 @@ class StorageHandler:
         if not storage_info or storage_info["free_gb"] >= self.min_free_space_gb:
             return result
             
-        captures = self.list_captures()
-        for capture in captures:
+        if captures is None:
+            captures = self.list_captures()
+        if not captures or captures[-1]["age_days"] <= self.max_age_days:
+            return result  # Even the oldest capture is recent enough
+            
+        # The listing is sorted newest first, so walking it backwards streams
+        # stale captures oldest first and stops at the first recent one
+        def stale_captures():
+            for capture in reversed(captures):
+                if capture["age_days"] <= self.max_age_days:
+                    return
+                yield capture
+                
+        # Stat and unlink by name relative to the open directory to avoid a full
+        # path walk per file
+        dir_fd = None
+        if os.unlink in os.supports_dir_fd and os.stat in os.supports_dir_fd:
+            try:
+                dir_fd = os.open(storage, os.O_RDONLY | os.O_DIRECTORY)
+            except OSError:
+                dir_fd = None
+                
+        def unlink_capture(capture) -> Optional[int]:
+            # Only stale files are stat'ed, for their size, right before removal
             try:
-                # Remove files older than max_age_days
-                if capture["age_days"] > self.max_age_days:
-                    file_path = Path(capture["path"])
-                    if file_path.exists():
-                        size = file_path.stat().st_size
-                        file_path.unlink()
-                        result["deleted"] += 1
-                        result["freed_space"] += size // (2**20)  # Convert to MB
-                        
-                # Check if we've freed enough space
+                if dir_fd is not None:
+                    name = os.path.basename(capture["path"])
+                    size = os.stat(name, dir_fd=dir_fd).st_size
+                    os.unlink(name, dir_fd=dir_fd)
+                else:
+                    size = os.stat(capture["path"]).st_size
+                    os.unlink(capture["path"])
+                return size
+            except OSError:
+                return None  # Includes files already removed
+                
+        try:
+            # Deletions stay serial: every capture is in one directory, and
+            # unlinkat holds its inode lock, so they cannot run in parallel
+            freed_since_check = 0
+            for capture in stale_captures():
+                size = unlink_capture(capture)
+                if size is None:
+                    continue
+                result["deleted"] += 1
+                result["freed_space"] += size // (2**20)  # Convert to MB
+                freed_since_check += size
+                
+                # Free space is reported in whole GB, so only re-query the
+                # filesystem once a meaningful amount has been freed
+                if freed_since_check < SPACE_RECHECK_BYTES:
+                    continue
+                freed_since_check = 0
                 current_info = self.get_storage_info()
                 if current_info and current_info["free_gb"] >= self.min_free_space_gb:
                     break
-            except OSError:
-                continue
+        finally:
+            if dir_fd is not None:
+                os.close(dir_fd)
                 
         return result
     
@@ -163,15 +342,16 @@ class StorageHandler:
         if not storage_info:
             return {"status": "error", "message": "Storage not accessible"}
             
+        captures = self.list_captures()
         status = {
             "status": "ok",
             "storage_info": storage_info,
-            "captures": len(self.list_captures()),
+            "captures": len(captures),
             "cleanup_needed": storage_info["free_gb"] < self.min_free_space_gb
         }
         
         if status["cleanup_needed"]:
-            cleanup_result = self.cleanup_old_captures()
+            cleanup_result = self.cleanup_old_captures(captures)
             status["cleanup_result"] = cleanup_result
             
         return status
@@ -1,68 +1,207 @@
 import cairo
+import cv2
 import numpy as np
-from typing import Dict, Optional
-import gc
+from collections import deque
+from typing import Deque, Dict, Optional, Tuple
+import logging
 import math
+import sys
+
+logger = logging.getLogger(__name__)
+
+def _surface_refcount(pair):
+    """Return the reference count of the surface in a ring pair."""
+    return sys.getrefcount(pair[1])
+
+# Count reported for a surface referenced only by its ring pair
+_UNHELD_REFCOUNT = _surface_refcount((None, object()))
 
 class CairoSurfaceHandler:
-    # Class-level storage for data references
-    _data_refs: Dict[int, np.ndarray] = {}
+    # Ring of (buffer, surface) pairs reused oldest first, keyed by (height, width)
+    _surface_rings: Dict[Tuple[int, int], Deque[Tuple[np.ndarray, cairo.ImageSurface]]] = {}
+    _RING_SIZE = 3
+    # (key, layout) of the last scale_and_center placement
+    _layout_cache: Tuple[Optional[tuple], Optional[Tuple[cairo.Matrix, float]]] = (None, None)
     
     @staticmethod
     def create_surface_from_frame(frame):
-        """Create a Cairo surface from a numpy array frame."""
+        """Create a Cairo surface from a numpy array frame.
+        
+        The surface keeps its pixel buffer alive through create_for_data.
+        Buffers come from a small per-size ring. A pair is only reused once
+        nothing outside the ring references its surface, so a surface the
+        caller still holds keeps its pixels.
+        
+        Accepts grayscale, RGB, or 4-channel frames that are already BGRA
+        (Cairo's native layout), which are copied without conversion.
+        """
         if frame is None or not isinstance(frame, np.ndarray) or len(frame.shape) < 2:
             raise ValueError("Invalid frame")
             
         height, width = frame.shape[:2]
         
-        # Create a writeable copy with proper memory layout
-        frame_copy = np.zeros((height, width, 4), dtype=np.uint8)
-        frame_copy[..., :3] = frame
-        frame_copy[..., 3] = 255  # Alpha channel
-        frame_copy = np.ascontiguousarray(frame_copy)
+        # Cairo's ARGB32 is BGRA in memory on little-endian hosts; convert in
+        # a single OpenCV pass, which also sets the alpha channel to 255
+        if frame.ndim == 2:
+            conversion = cv2.COLOR_GRAY2BGRA
+        elif frame.ndim == 3 and frame.shape[2] == 3:
+            conversion = cv2.COLOR_RGB2BGRA
+        elif frame.ndim == 3 and frame.shape[2] == 4:
+            conversion = None
+        else:
+            raise ValueError("Invalid frame")
         
-        stride = width * 4
+        # Once the ring is full, reuse the oldest pair no caller still holds
+        ring = CairoSurfaceHandler._surface_rings.setdefault((height, width), deque())
+        free = None
+        if len(ring) >= CairoSurfaceHandler._RING_SIZE:
+            for index in range(len(ring)):
+                if _surface_refcount(ring[index]) <= _UNHELD_REFCOUNT:
+                    free = index
+                    break
+        if free is not None:
+            frame_copy, surface = ring[free]
+            del ring[free]
+            surface.flush()
+        else:
+            if len(ring) >= CairoSurfaceHandler._RING_SIZE:
+                # Every pair is still held; the holder keeps the oldest alive
+                ring.popleft()
+            frame_copy = np.empty((height, width, 4), dtype=np.uint8)
+            surface = cairo.ImageSurface.create_for_data(
+                frame_copy.data,
+                cairo.FORMAT_ARGB32,
+                width,
+                height,
+                frame_copy.strides[0]
+            )
+        ring.append((frame_copy, surface))
         
-        surface = cairo.ImageSurface.create_for_data(
-            frame_copy.data,
-            cairo.FORMAT_ARGB32,
+        if conversion is None:
+            np.copyto(frame_copy, frame)
+        else:
+            cv2.cvtColor(np.ascontiguousarray(frame), conversion, dst=frame_copy)
+        surface.mark_dirty()
+        return surface
+        
+    @staticmethod
+    def wrap_frame_buffer(buffer, opaque=False):
+        """Create a Cairo surface that draws directly from a BGRA buffer.
+        
+        Unlike create_surface_from_frame nothing is copied: the caller keeps
+        writing frames into buffer and calls surface.mark_dirty() before the
+        surface is drawn again.
+        
+        With opaque=True the alpha byte is ignored (FORMAT_RGB24), which lets
+        Cairo paint the frame without blending.
+        """
+        if (not isinstance(buffer, np.ndarray) or buffer.dtype != np.uint8 or
+                buffer.ndim != 3 or buffer.shape[2] != 4 or not buffer.flags.c_contiguous):
+            raise ValueError("Buffer must be a contiguous (H, W, 4) uint8 array")
+            
+        height, width = buffer.shape[:2]
+        return cairo.ImageSurface.create_for_data(
+            buffer.data,
+            cairo.FORMAT_RGB24 if opaque else cairo.FORMAT_ARGB32,
             width,
             height,
-            stride
+            buffer.strides[0]
         )
         
-        # Store reference in class dict using surface address as key
-        surface_id = id(surface)
-        CairoSurfaceHandler._data_refs[surface_id] = frame_copy
-        
-        # Return a wrapped surface that will handle cleanup
-        return _ManagedCairoSurface(surface, surface_id)
-    
-    @staticmethod
-    def _cleanup_ref(surface_id):
-        """Clean up the data reference for a given surface ID."""
-        CairoSurfaceHandler._data_refs.pop(surface_id, None)
-        
     @staticmethod
     def scale_and_center(ctx, surface, target_width, target_height):
-        """Scale and center a surface in the given context."""
+        """Scale and center a surface in the given context.
+        
+        Offsets are whole pixels, and enlargements use nearest-neighbour
+        filtering.
+        """
         if surface is None or target_width <= 0 or target_height <= 0:
             return
             
-        # If we have a managed surface, get the underlying cairo surface
-        if isinstance(surface, _ManagedCairoSurface):
-            surface = surface.surface
-            
         surface_width = surface.get_width()
         surface_height = surface.get_height()
         
         if surface_width <= 0 or surface_height <= 0:
             return
             
+        # 1:1 draw needs no transform
+        if surface_width == target_width and surface_height == target_height:
+            try:
+                ctx.save()
+                try:
+                    ctx.set_source_surface(surface, 0, 0)
+                    ctx.paint()
+                finally:
+                    ctx.restore()
+            except cairo.Error as e:
+                logger.error(f"Cairo error during drawing: {e}")
+            return
+            
+        layout = CairoSurfaceHandler._fit_layout(
+            surface_width, surface_height, target_width, target_height)
+        if layout is None:
+            return
+        matrix, scale = layout
+            
+        try:
+            ctx.save()
+            try:
+                ctx.transform(matrix)
+                ctx.set_source_surface(surface, 0, 0)
+                if scale >= 1:
+                    # Low-resolution thermal frames are enlarged with square
+                    # pixels, which is also cheaper than bilinear sampling
+                    ctx.get_source().set_filter(cairo.FILTER_NEAREST)
+                ctx.paint()
+            finally:
+                # Restore context state even if painting fails
+                ctx.restore()
+        except cairo.Error as e:
+            logger.error(f"Cairo error during drawing: {e}")
+            
+    @staticmethod
+    def target_rows_rect(surface_width, surface_height, target_width, target_height, start, end):
+        """Return the target area (x, y, width, height) showing surface rows [start, end).
+        
+        Uses the same placement as scale_and_center, widened to whole pixels.
+        Returns None if the surface cannot be placed in the target.
+        """
+        if surface_width <= 0 or surface_height <= 0 or target_width <= 0 or target_height <= 0:
+            return None
+        layout = CairoSurfaceHandler._fit_layout(
+            surface_width, surface_height, target_width, target_height)
+        if layout is None:
+            return None
+        matrix, _ = layout
+        x0, y0 = matrix.transform_point(0, start)
+        x1, y1 = matrix.transform_point(surface_width, end)
+        top = max(math.floor(y0) - 1, 0)
+        bottom = min(math.ceil(y1) + 1, target_height)
+        left = math.floor(x0)
+        return (left, top, math.ceil(x1) - left, max(bottom - top, 0))
+        
+    @staticmethod
+    def _fit_layout(surface_width, surface_height, target_width, target_height):
+        """Return the (matrix, scale) fitting a surface into the target area.
+        
+        The drawing area size rarely changes between paints, so the last
+        layout is cached. Returns None if no valid layout exists.
+        """
+        key = (surface_width, surface_height, target_width, target_height)
+        cached_key, layout = CairoSurfaceHandler._layout_cache
+        if key == cached_key:
+            return layout
+            
+        layout = CairoSurfaceHandler._compute_layout(*key)
+        CairoSurfaceHandler._layout_cache = (key, layout)
+        return layout
+        
+    @staticmethod
+    def _compute_layout(surface_width, surface_height, target_width, target_height):
+        """Compute the aspect-preserving, centered (matrix, scale) or None."""
         # Handle infinite or NaN values
         if not (math.isfinite(target_width) and math.isfinite(target_height)):
-            return
+            return None
             
         try:
             # Calculate scale while preserving aspect ratio
@@ -72,7 +211,7 @@ class CairoSurfaceHandler:
             
             # Ensure scale is valid and finite
             if not math.isfinite(scale) or scale <= 0:
-                return
+                return None
                        
             new_width = int(surface_width * scale)
             new_height = int(surface_height * scale)
@@ -80,42 +219,11 @@ class CairoSurfaceHandler:
             # Calculate centering offsets
             x_offset = int((target_width - new_width) / 2)
             y_offset = int((target_height - new_height) / 2)
+        except (OverflowError, ValueError):
+            return None
             
-            # Ensure offsets are valid
-            if not (math.isfinite(x_offset) and math.isfinite(y_offset)):
-                return
-            
-            # Ensure values are within reasonable bounds to prevent overflow
-            if any(abs(v) > 1e6 for v in [new_width, new_height, x_offset, y_offset, scale]):
-                return
+        # Ensure values are within reasonable bounds to prevent overflow
+        if any(abs(v) > 1e6 for v in [new_width, new_height, x_offset, y_offset, scale]):
+            return None
             
-            ctx.save()
-            ctx.translate(x_offset, y_offset)
-            ctx.scale(scale, scale)
-            ctx.set_source_surface(surface, 0, 0)
-            ctx.paint()
-            ctx.restore()
-        except (cairo.Error, OverflowError, ValueError) as e:
-            print(f"Cairo error during drawing: {e}")
-            # Restore context state even if painting fails
-            ctx.restore()
-
-class _ManagedCairoSurface:
-    """A wrapper for cairo.ImageSurface that handles cleanup of numpy array data."""
-    
-    def __init__(self, surface: cairo.ImageSurface, surface_id: int):
-        self.surface = surface
-        self.surface_id = surface_id
-        
-    def __del__(self):
-        """Clean up when the surface is garbage collected."""
-        CairoSurfaceHandler._cleanup_ref(self.surface_id)
-        
-    def get_width(self):
-        return self.surface.get_width()
-        
-    def get_height(self):
-        return self.surface.get_height()
-        
-    def get_data(self):
-        return self.surface.get_data()
+        return cairo.Matrix(scale, 0, 0, scale, x_offset, y_offset), scale
@@ -6,8 +6,14 @@ import cv2
 from dataclasses import dataclass
 from threading import Lock
 
+# Inter-frame time below which the feed counts as too fast (above 35 FPS)
+_HIGH_FPS_FRAME_NS = 1_000_000_000 // 35
+
 @dataclass
 class FrameMetrics:
+    # Explicit __slots__ (dataclass(slots=True) needs Python 3.10)
+    __slots__ = ('fps', 'frame_time', 'dropped_frames', 'buffer_usage')
+    
     fps: float
     frame_time: float
     dropped_frames: int
@@ -19,11 +25,18 @@ class LiveViewHandler:
         
         Args:
             buffer_size: Maximum number of frames to keep in buffer
+            
+        Frames are expected to be pushed by a single producer (process_frame)
+        and read by a single consumer (get_latest_frame). Neither takes the
+        lock; it only guards the multi-field reset in clear_buffer and
+        get_metrics.
         """
         self._frame_buffer: Deque[np.ndarray] = deque(maxlen=buffer_size)
+        self._maxlen = buffer_size
         self._metrics = FrameMetrics(fps=0.0, frame_time=0.0, dropped_frames=0, buffer_usage=0.0)
-        self._last_frame_time = time.time()
-        self._fps_samples: Deque[float] = deque(maxlen=30)  # Rolling window for FPS calculation
+        self._last_frame_time = time.monotonic_ns()
+        # Exponential moving average of the inter-frame time (weight 1/16)
+        self._ema_frame_ns = 0
         self._frame_lock = Lock()
         self._processing = False
         self._skip_next = False
@@ -35,52 +48,60 @@ class LiveViewHandler:
             frame: Input frame to process
             
         Returns:
-            Tuple of (processed frame, current metrics)
+            Tuple of (processed frame, current metrics). The fps field is
+            only refreshed by get_metrics.
         """
-        current_time = time.time()
-        frame_time = current_time - self._last_frame_time
+        # Frame timing is kept in integer nanoseconds on the monotonic clock
+        current_time = time.monotonic_ns()
+        frame_time_ns = current_time - self._last_frame_time
         self._last_frame_time = current_time
         
-        # Update FPS calculation
-        if frame_time > 0:
-            self._fps_samples.append(1.0 / frame_time)
+        # Bind hot attributes to locals once per frame
+        frame_buffer = self._frame_buffer
+        metrics = self._metrics
+        
+        # Update the frame time average in integer nanoseconds; FPS is only
+        # derived from it when metrics are requested. Skipping is decided on
+        # the estimate from previous frames.
+        ema_ns = self._ema_frame_ns
+        if frame_time_ns > 0:
+            self._ema_frame_ns = frame_time_ns if ema_ns == 0 else (ema_ns * 15 + frame_time_ns) >> 4
         
         # Check if we should skip this frame
-        if self._should_skip_frame(frame_time):
-            self._metrics.dropped_frames += 1
-            return None, self._metrics
-            
-        with self._frame_lock:
-            # Add frame to buffer
-            self._frame_buffer.append(frame)
-            
-            # Update metrics
-            self._metrics.fps = sum(self._fps_samples) / len(self._fps_samples) if self._fps_samples else 0
-            self._metrics.frame_time = frame_time
-            self._metrics.buffer_usage = len(self._frame_buffer) / self._frame_buffer.maxlen
+        if self._should_skip_frame(frame_time_ns, len(frame_buffer), ema_ns):
+            metrics.dropped_frames += 1
+            return None, metrics
             
-            # Return most recent frame
-            return frame, self._metrics
+        # Add frame to buffer; a bounded deque append is atomic under the GIL
+        frame_buffer.append(frame)
+        
+        # Update metrics
+        metrics.frame_time = frame_time_ns / 1e9
+        
+        # Return most recent frame
+        return frame, metrics
     
-    def _should_skip_frame(self, frame_time: float) -> bool:
+    def _should_skip_frame(self, frame_time_ns: int, buffer_len: int, ema_frame_ns: int) -> bool:
         """Determine if we should skip processing this frame.
         
         Args:
-            frame_time: Time since last frame
+            frame_time_ns: Time since last frame in nanoseconds
+            buffer_len: Number of frames currently buffered
+            ema_frame_ns: Average frame time in nanoseconds (0 if unknown)
             
         Returns:
             True if frame should be skipped
         """
         # Skip if we're falling behind (frame time > 2x target frame time)
-        if frame_time > 0.080:  # More than 80ms (targeting ~30fps)
+        if frame_time_ns > 80_000_000:  # More than 80ms (targeting ~30fps)
             return True
             
         # Skip if buffer is nearly full
-        if len(self._frame_buffer) >= self._frame_buffer.maxlen * 0.9:
+        if buffer_len * 10 >= self._maxlen * 9:
             return True
             
         # Skip every other frame if FPS is too high
-        if self._metrics.fps > 35:
+        if 0 < ema_frame_ns < _HIGH_FPS_FRAME_NS:
             self._skip_next = not self._skip_next
             return self._skip_next
             
@@ -92,21 +113,23 @@ class LiveViewHandler:
         Returns:
             Latest frame or None if buffer is empty
         """
-        with self._frame_lock:
-            return self._frame_buffer[-1] if self._frame_buffer else None
+        try:
+            return self._frame_buffer[-1]
+        except IndexError:
+            return None
     
     def clear_buffer(self) -> None:
         """Clear the frame buffer and reset metrics."""
         with self._frame_lock:
             self._frame_buffer.clear()
-            self._fps_samples.clear()
+            self._ema_frame_ns = 0
             self._metrics = FrameMetrics(
                 fps=0.0,
                 frame_time=0.0,
                 dropped_frames=0,
                 buffer_usage=0.0
             )
-            self._last_frame_time = time.time()
+            self._last_frame_time = time.monotonic_ns()
             self._skip_next = False
     
     def get_metrics(self) -> FrameMetrics:
@@ -116,6 +139,8 @@ class LiveViewHandler:
             Current FrameMetrics
         """
         with self._frame_lock:
-            # Ensure buffer usage is accurate
-            self._metrics.buffer_usage = len(self._frame_buffer) / self._frame_buffer.maxlen
+            # FPS and buffer usage are only computed when metrics are requested
+            ema_ns = self._ema_frame_ns
+            self._metrics.fps = 1e9 / ema_ns if ema_ns else 0.0
+            self._metrics.buffer_usage = len(self._frame_buffer) / self._maxlen
             return self._metrics
\ No newline at end of file
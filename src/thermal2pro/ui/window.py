@@ -9,16 +9,104 @@ except ValueError:
 from gi.repository import Gtk, GLib, Gdk
 import cv2
 import numpy as np
-from datetime import datetime
 import cairo
 from pathlib import Path
 import logging
+import threading
+import time
+import zlib
+from concurrent.futures import ThreadPoolExecutor
+try:
+    from turbojpeg import TurboJPEG, TJPF_BGR, TJFLAG_FASTDCT
+except ImportError:  # PyTurboJPEG is optional; cv2.imwrite is used without it
+    TurboJPEG = None
 from thermal2pro.ui.cairo_handler import CairoSurfaceHandler
 from thermal2pro.ui.live_view import LiveViewHandler
 from thermal2pro.camera.mock_camera import MockThermalCamera
+from thermal2pro.camera.processing import RawNormalizer, apply_lut, build_bgra_lut
+from thermal2pro.storage.handler import format_capture_timestamp
 
 logger = logging.getLogger(__name__)
 
+# GTK major version, resolved once at import for all version branches
+_GTK4 = Gtk._version.startswith('4')
+
+# Child packing differs between GTK versions; pick the variant once
+if _GTK4:
+    def _pack(box, widget, expand=True):
+        box.append(widget)
+    _set_child = Gtk.Window.set_child
+else:
+    def _pack(box, widget, expand=True):
+        box.pack_start(widget, expand, expand, 0)
+    _set_child = Gtk.Container.add
+
+# Drop effects GTK4 draws expensively without a GPU (e.g. on the Pi)
+_FLAT_CSS = b"* { border-radius: 0; box-shadow: none; transition: none; } button { min-height: 40px; }"
+_flat_css_installed = False
+
+def _install_flat_css():
+    """Apply _FLAT_CSS to the default display, at most once per process."""
+    global _flat_css_installed
+    display = Gdk.Display.get_default()
+    if _flat_css_installed or display is None:
+        return
+    provider = Gtk.CssProvider()
+    provider.load_from_data(_FLAT_CSS)
+    Gtk.StyleContext.add_provider_for_display(
+        display, provider, Gtk.STYLE_PROVIDER_PRIORITY_APPLICATION)
+    _flat_css_installed = True
+
+# How long the capture thread keeps grabbing to drain queued frames
+_CAPTURE_DRAIN_NS = 2_000_000
+
+# Packed 4:2:2 formats whose even bytes are the Y (intensity) plane
+_YUYV_FOURCCS = (cv2.VideoWriter_fourcc(*"YUYV"), cv2.VideoWriter_fourcc(*"YUY2"))
+
+# JPEG quality for captures
+_JPEG_QUALITY = 85
+
+# Position and size of the metrics overlay box
+_METRICS_OVERLAY_RECT = (10, 10, 200, 90)
+# Metrics overlay labels, one per line, and the line height in pixels
+_METRICS_LABELS = ("FPS: ", "Frame Time: ", "Dropped Frames: ", "Buffer Usage: ")
+_METRICS_LINE_HEIGHT = 20
+
+def _changed_rows(frame, previous, diff, dirty):
+    """Return the [start, end) band of rows that differ between two frames.
+    
+    diff (H, W) and dirty (H,) are preallocated bool scratch buffers.
+    Returns None when the frames cannot be compared and (0, 0) when they
+    are identical.
+    """
+    if previous is None or previous.shape != frame.shape or diff.shape != frame.shape[:2]:
+        return None
+    # Compare whole BGRA pixels as 32-bit words
+    height = frame.shape[0]
+    np.not_equal(frame.view(np.uint32).reshape(height, -1),
+                 previous.view(np.uint32).reshape(height, -1), out=diff)
+    diff.any(axis=1, out=dirty)
+    start = int(dirty.argmax())
+    if not dirty[start]:
+        return (0, 0)
+    return (start, height - int(dirty[::-1].argmax()))
+
+def _merge_rows(rows, other):
+    """Union of two changed-row bands, either of which may be None."""
+    if rows is None or other is None:
+        return None
+    if rows[0] == rows[1]:
+        return other
+    if other[0] == other[1]:
+        return rows
+    return (min(rows[0], other[0]), max(rows[1], other[1]))
+
+# Palette selector entries and their colormaps, by dropdown position
+_PALETTE_NAMES = ("Iron", "Rainbow", "Gray")
+_PALETTES = (cv2.COLORMAP_HOT, cv2.COLORMAP_JET, cv2.COLORMAP_BONE)
+# BGRA lookup table per palette, built once so switching is a reference swap
+_PALETTE_LUTS = tuple(build_bgra_lut(colormap) for colormap in _PALETTES)
+
 class ThermalWindow(Gtk.ApplicationWindow):
     def __init__(self, app, use_mock_camera=False):
         super().__init__(application=app)
@@ -27,161 +115,407 @@ class ThermalWindow(Gtk.ApplicationWindow):
         # Set default window size
         self.set_default_size(800, 600)
         
-        # Center window - handle GTK version differences
-        if hasattr(Gtk.WindowPosition, 'CENTER'):
-            # GTK3 style
+        # Center window; GTK4 leaves placement to the window manager
+        if not _GTK4:
             self.set_position(Gtk.WindowPosition.CENTER)
-        else:
-            # GTK4 style - default to center
-            screen = self.get_screen()
-            if screen:
-                monitor = screen.get_monitor_at_window(screen.get_active_window())
-                geometry = monitor.get_geometry()
-                x = (geometry.width - 800) // 2
-                y = (geometry.height - 600) // 2
-                self.move(x, y)
 
         # Main vertical box
         self.box = Gtk.Box(orientation=Gtk.Orientation.VERTICAL)
-        if Gtk._version.startswith('4'):
-            self.set_child(self.box)
-        else:
-            self.add(self.box)
+        if _GTK4:
+            _install_flat_css()
+        _set_child(self, self.box)
 
-        # Camera view area
+        # Camera view area. GTK4 shows frames as textures in a Gtk.Picture so
+        # scaling and compositing happen in the GSK renderer; the drawing
+        # area on top only draws the metrics overlay there.
         self.drawing_area = Gtk.DrawingArea()
-        if Gtk._version.startswith('4'):
-            self.drawing_area.set_draw_func(self.draw_frame)
+        if _GTK4:
+            self.picture = Gtk.Picture()
+            self.picture.set_hexpand(True)
+            self.picture.set_vexpand(True)
+            self.drawing_area.set_draw_func(self.draw_overlay)
+            self.drawing_area.set_can_target(False)
+            view = Gtk.Overlay()
+            view.set_child(self.picture)
+            view.add_overlay(self.drawing_area)
         else:
             self.drawing_area.connect("draw", self.draw_frame_gtk3)
         
-        # Add drawing area to box
-        if Gtk._version.startswith('4'):
-            self.box.append(self.drawing_area)
-        else:
-            self.box.pack_start(self.drawing_area, True, True, 0)
+        # Add camera view to box
+        _pack(self.box, view if _GTK4 else self.drawing_area)
 
         # Button bar at bottom
         button_bar = Gtk.Box(orientation=Gtk.Orientation.HORIZONTAL)
         button_bar.set_spacing(10)
-        if Gtk._version.startswith('4'):
-            button_bar.set_margin_start(10)
-            button_bar.set_margin_end(10)
-            button_bar.set_margin_bottom(10)
-        else:
-            button_bar.set_margin_left(10)
-            button_bar.set_margin_right(10)
-            button_bar.set_margin_bottom(10)
+        button_bar.set_margin_start(10)
+        button_bar.set_margin_end(10)
+        button_bar.set_margin_bottom(10)
 
         # Large touch-friendly capture button
         capture_button = Gtk.Button(label="Capture")
         capture_button.connect("clicked", self.capture_image)
         capture_button.set_vexpand(False)
         capture_button.set_hexpand(True)
-        if Gtk._version.startswith('4'):
-            button_bar.append(capture_button)
-        else:
-            button_bar.pack_start(capture_button, True, True, 0)
+        _pack(button_bar, capture_button)
 
         # Color palette selector
-        if Gtk._version.startswith('4'):
+        if _GTK4:
             palette_store = Gtk.StringList()
-            for name in ["Iron", "Rainbow", "Gray"]:
+            for name in _PALETTE_NAMES:
                 palette_store.append(name)
             self.palette_dropdown = Gtk.DropDown(model=palette_store)
         else:
             palette_store = Gtk.ListStore(str)
-            for name in ["Iron", "Rainbow", "Gray"]:
+            for name in _PALETTE_NAMES:
                 palette_store.append([name])
             self.palette_dropdown = Gtk.ComboBox.new_with_model(palette_store)
             renderer_text = Gtk.CellRendererText()
             self.palette_dropdown.pack_start(renderer_text, True)
             self.palette_dropdown.add_attribute(renderer_text, "text", 0)
 
-        self.palette_dropdown.connect("changed" if Gtk._version.startswith('3') else "notify::selected", self.change_palette)
+        self.palette_dropdown.connect("notify::selected" if _GTK4 else "changed", self.change_palette)
+        # Bind the version-specific selection getter once for change_palette
+        self._get_palette_index = Gtk.DropDown.get_selected if _GTK4 else Gtk.ComboBox.get_active
         self.palette_dropdown.set_vexpand(False)
         self.palette_dropdown.set_hexpand(True)
-        if Gtk._version.startswith('4'):
-            button_bar.append(self.palette_dropdown)
-        else:
-            button_bar.pack_start(self.palette_dropdown, True, True, 0)
+        _pack(button_bar, self.palette_dropdown)
 
         # Performance metrics toggle button
         metrics_button = Gtk.Button(label="Metrics")
         metrics_button.connect("clicked", self.toggle_metrics)
         metrics_button.set_vexpand(False)
         metrics_button.set_hexpand(False)
-        if Gtk._version.startswith('4'):
-            button_bar.append(metrics_button)
-        else:
-            button_bar.pack_start(metrics_button, False, False, 0)
+        _pack(button_bar, metrics_button, expand=False)
 
         # Add button bar to main box
-        if Gtk._version.startswith('4'):
-            self.box.append(button_bar)
-        else:
-            self.box.pack_start(button_bar, False, False, 0)
+        _pack(self.box, button_bar, expand=False)
 
         # Initialize camera
         self.cap = None
+        # (height, width) of raw YUYV frames, or None when frames are decoded
+        self._yuyv_shape = None
         try:
             if use_mock_camera:
                 logger.info("Using mock camera")
-                self.cap = MockThermalCamera()
+                self.cap = MockThermalCamera(grayscale=True)
             else:
                 logger.info("Attempting to initialize real camera")
                 self.cap = cv2.VideoCapture(0)
                 if not self.cap.isOpened():
                     raise RuntimeError("Failed to open camera")
+                # Request MJPEG before the frame size: many UVC cameras default
+                # to YUYV, which needs twice the USB bandwidth
+                if not self.cap.set(cv2.CAP_PROP_FOURCC, cv2.VideoWriter_fourcc(*"MJPG")):
+                    logger.info("Camera does not accept MJPEG, keeping its default format")
                 self.cap.set(cv2.CAP_PROP_FRAME_WIDTH, 256)
                 self.cap.set(cv2.CAP_PROP_FRAME_HEIGHT, 192)
                 self.cap.set(cv2.CAP_PROP_BUFFERSIZE, 1)
                 self.cap.set(cv2.CAP_PROP_FPS, 30)
+                if int(self.cap.get(cv2.CAP_PROP_FOURCC)) in _YUYV_FOURCCS:
+                    # The Y plane already is the intensity image, so take the
+                    # raw frames and skip OpenCV's YUYV to BGR conversion
+                    if self.cap.set(cv2.CAP_PROP_CONVERT_RGB, 0):
+                        self._yuyv_shape = (int(self.cap.get(cv2.CAP_PROP_FRAME_HEIGHT)),
+                                            int(self.cap.get(cv2.CAP_PROP_FRAME_WIDTH)))
             
             if not self.cap or not self.cap.isOpened():
                 logger.warning("Real camera not available, falling back to mock camera")
-                self.cap = MockThermalCamera()
+                self.cap = MockThermalCamera(grayscale=True)
             
             logger.info("Camera initialized successfully")
             
         except Exception as e:
             logger.warning(f"Camera initialization failed: {e}, falling back to mock camera")
-            self.cap = MockThermalCamera()
+            self.cap = MockThermalCamera(grayscale=True)
 
         self.current_palette = cv2.COLORMAP_JET
+        # BGRA lookup table for the current palette. Frames come out in
+        # Cairo's native layout, so drawing needs no channel swizzle.
+        self._palette_lut = _PALETTE_LUTS[_PALETTES.index(self.current_palette)]
+        # BGRA output buffers, allocated once the frame size is known. Three
+        # are needed so the capture thread always has one that is neither on
+        # screen nor waiting to be shown.
+        self._frame_buffers = None
+        # Scratch buffers for changed-row detection, sized with the above
+        self._row_diff = np.empty((0, 0), dtype=bool)
+        self._dirty_rows = np.empty(0, dtype=bool)
+        # Cairo surfaces wrapping each output buffer, keyed by buffer id
+        self._frame_surfaces = {}
+        self._current_surface = None
+        # Camera frames are retrieved into the array from the previous read,
+        # which OpenCV reuses when the size has not changed
+        self._capture_buf = None
+        # (raw frame checksum, palette table) of the last published frame
+        self._published_key = (None, None)
+        # Quantizes 16-bit radiometric frames to 8-bit before colorizing
+        self._raw_normalizer = RawNormalizer()
+        # Normalizer and palette tables composed into one 16-bit table, and
+        # the (normalizer version, palette table) it was built from
+        self._fused_lut = None
+        self._fused_key = (None, None)
         self.current_frame = None
+        # Latest accepted frame not yet picked up by the main thread
+        self._pending_frame = None
+        # Frame rows [start, end) changed since the frame on screen, or None
+        # when the whole frame must be redrawn
+        self._pending_rows = None
+        # Last frame handed to the main loop, for changed-row detection
+        self._published_frame = None
+        self._frame_lock = threading.Lock()
         self.live_view = LiveViewHandler(buffer_size=5)
         self.show_metrics = False
+        # Captures are written on a single background thread so slow storage
+        # does not stall the UI
+        self._io_pool = ThreadPoolExecutor(max_workers=1, thread_name_prefix="thermal-io")
+        # Capture directory, resolved on the first capture
+        self._capture_dir = None
+        self._jpeg_encoder = None
+        if TurboJPEG is not None:
+            try:
+                self._jpeg_encoder = TurboJPEG()
+            except (OSError, RuntimeError) as e:
+                logger.warning(f"libturbojpeg unavailable, using OpenCV for captures: {e}")
+        # Rendered metrics overlay and the values it shows. The background
+        # and labels are rendered once into _metrics_labels, with the x
+        # position of each value, so only changed values are redrawn.
+        self._metrics_surface = None
+        self._metrics_key = None
+        self._metrics_labels = None
+        self._metrics_value_x = ()
+
+        # New frames are picked up on frame clock ticks, which follow the
+        # display refresh and pause while the window is not visible
+        self._tick_id = self.drawing_area.add_tick_callback(self._on_tick)
+
+        # While nothing can be seen, the capture thread only drains the
+        # camera. Read from that thread without locking.
+        self._area_mapped = False
+        self._minimized = False
+        self._display_visible = False
+        self.drawing_area.connect("map", self._on_area_mapped, True)
+        self.drawing_area.connect("unmap", self._on_area_mapped, False)
+        if _GTK4:
+            self.connect("realize", self._watch_toplevel_state)
+        else:
+            self.connect("window-state-event", self._on_window_state_event)
 
-        # Update frame every 16ms (targeting 60 FPS max)
-        GLib.timeout_add(16, self.update_frame)
+        # Camera reads block, so capture and colorize on a worker thread and
+        # hand finished frames to the main loop for drawing only
+        self._stop_capture = threading.Event()
+        self._capture_thread = threading.Thread(
+            target=self._capture_loop, name="thermal-capture", daemon=True)
+        self._capture_thread.start()
+        if not _GTK4:
+            # GTK3 has no close-request; stop capture on delete-event instead
+            self.connect("delete-event", lambda *args: self.do_close_request())
         logger.info("Window initialization complete")
 
+    def _capture_loop(self):
+        """Read frames on the capture thread until the window closes."""
+        while not self._stop_capture.is_set():
+            try:
+                if not self.update_frame():
+                    # No frame available; back off briefly instead of spinning
+                    self._stop_capture.wait(0.01)
+            except Exception as e:
+                logger.error(f"Error updating frame: {e}")
+                return
+
     def update_frame(self):
-        try:
-            ret, frame = self.cap.read()
-            if ret:
-                # Convert to grayscale and apply color palette
-                gray = cv2.cvtColor(frame, cv2.COLOR_BGR2GRAY)
-                colored = cv2.applyColorMap(gray, self.current_palette)
-                rgb_frame = cv2.cvtColor(colored, cv2.COLOR_BGR2RGB)
-                
-                # Process frame through live view handler
-                processed_frame, _ = self.live_view.process_frame(rgb_frame)
-                if processed_frame is not None:
-                    self.current_frame = processed_frame
-                    self.drawing_area.queue_draw()
-            return True
-        except Exception as e:
-            logger.error(f"Error updating frame: {e}")
+        """Read, colorize and publish one camera frame.
+        
+        Runs on the capture thread. Accepted frames are left in a single
+        pending slot for _on_tick; if the display falls behind, only the
+        newest frame is shown.
+        
+        Returns:
+            False if no frame could be read
+        """
+        # grab() and retrieve() are split so the decode only happens for a
+        # frame that will actually be used. Frames already queued by the
+        # driver come back from grab() immediately, so keep grabbing for a
+        # short window to skip past them to the newest one.
+        deadline = time.monotonic_ns() + _CAPTURE_DRAIN_NS
+        grabbed = False
+        while self.cap.grab():
+            grabbed = True
+            if time.monotonic_ns() >= deadline:
+                break
+        if not grabbed:
             return False
+        if not self._display_visible:
+            return True  # Keep the queue drained but skip decode and colorize
+        ret, frame = self.cap.retrieve(self._capture_buf)
+        if not ret:
+            return False
+        self._capture_buf = frame
+        if self._yuyv_shape is not None:
+            # Raw YUYV may come back as one flat row of bytes
+            height, width = self._yuyv_shape
+            if frame.size != height * width * 2:
+                logger.warning(f"Raw frame of {frame.size} bytes does not match "
+                               f"{width}x{height} YUYV, using converted frames")
+                self.cap.set(cv2.CAP_PROP_CONVERT_RGB, 1)
+                self._yuyv_shape = None
+                self._capture_buf = None
+                return True
+            frame = frame.reshape(height, width, 2)
+        
+        # Stalled cameras tend to hand back the same frame again; if it
+        # matches the last published frame under the same palette there is
+        # nothing new to colorize or draw
+        palette_lut = self._palette_lut
+        checksum = zlib.crc32(frame if frame.flags.c_contiguous else np.ascontiguousarray(frame))
+        last_checksum, last_lut = self._published_key
+        if checksum == last_checksum and palette_lut is last_lut:
+            return True
+            
+        # Thermal frames are near-gray, so any single plane serves as
+        # intensity (for YUYV, plane 0 is Y); colorize straight to BGRA in
+        # one table lookup
+        gray = frame if frame.ndim == 2 else frame[:, :, 0]
+        table = palette_lut
+        if gray.dtype == np.uint16:
+            table = self._fused_raw_lut(gray, palette_lut)
+        bgra_frame = self._free_frame_buffer(gray.shape)
+        apply_lut(gray, table, bgra_frame)
+        
+        # Process frame through live view handler
+        processed_frame, _ = self.live_view.process_frame(bgra_frame)
+        if processed_frame is not None:
+            self._published_key = (checksum, palette_lut)
+            # Partial redraws are GTK3 only; GTK4 replaces the whole texture
+            rows = None if _GTK4 else _changed_rows(
+                processed_frame, self._published_frame, self._row_diff, self._dirty_rows)
+            with self._frame_lock:
+                if self._pending_frame is not None:
+                    # The frame on screen is older than the one replaced
+                    rows = _merge_rows(rows, self._pending_rows)
+                self._pending_frame = processed_frame
+                self._pending_rows = rows
+            self._published_frame = processed_frame
+        return True
+
+    def _on_area_mapped(self, widget, mapped):
+        self._area_mapped = mapped
+        self._update_display_visible()
+
+    def _on_window_state_event(self, widget, event):
+        self._minimized = bool(event.new_window_state & Gdk.WindowState.ICONIFIED)
+        self._update_display_visible()
+        return False
+
+    def _watch_toplevel_state(self, widget):
+        surface = self.get_surface()
+        if surface is not None:
+            surface.connect("notify::state", self._on_toplevel_state)
+
+    def _on_toplevel_state(self, surface, pspec):
+        self._minimized = bool(surface.get_state() & Gdk.ToplevelState.MINIMIZED)
+        self._update_display_visible()
+
+    def _update_display_visible(self):
+        self._display_visible = self._area_mapped and not self._minimized
+
+    def _fused_raw_lut(self, raw, palette_lut):
+        """Return a table mapping raw 16-bit values straight to BGRA.
+        
+        Composing the normalization table with the palette lets a 16-bit
+        frame be colorized in a single gather instead of two passes.
+        """
+        normalizer = self._raw_normalizer
+        normalizer.update(raw)
+        version, lut = self._fused_key
+        if version != normalizer.version or lut is not palette_lut:
+            self._fused_lut = palette_lut[normalizer.lut]
+            self._fused_key = (normalizer.version, palette_lut)
+        return self._fused_lut
+
+    def _on_tick(self, widget, frame_clock):
+        """Show the latest published frame, once per display frame."""
+        if self._pending_frame is None:
+            return GLib.SOURCE_CONTINUE
+        with self._frame_lock:
+            frame, self._pending_frame = self._pending_frame, None
+            rows = self._pending_rows
+            previous = self.current_frame
+            self.current_frame = frame
+        if _GTK4:
+            self.picture.set_paintable(self._frame_texture(frame))
+            if self.show_metrics:
+                self.drawing_area.queue_draw()
+            return GLib.SOURCE_CONTINUE
+            
+        surface = self._frame_surfaces.get(id(frame))
+        if surface is not None:
+            surface.mark_dirty()
+        self._current_surface = surface
+        
+        if rows is None or previous is None:
+            self.drawing_area.queue_draw()
+        else:
+            self._queue_draw_rows(frame, *rows)
+        return GLib.SOURCE_CONTINUE
+
+    @staticmethod
+    def _frame_texture(frame):
+        """Wrap a copy of a BGRA frame in a texture for the GTK4 renderer."""
+        height, width = frame.shape[:2]
+        # Frames are opaque, so straight and premultiplied alpha are the same;
+        # premultiplied BGRA is GDK's default format and needs no conversion.
+        # tobytes() copies the frame, and PyGObject copies those bytes again
+        # when marshalling them into GLib.Bytes; the texture owns that copy.
+        return Gdk.MemoryTexture.new(
+            width, height, Gdk.MemoryFormat.B8G8R8A8_PREMULTIPLIED,
+            GLib.Bytes.new_take(frame.tobytes()), frame.strides[0])
+
+    def _queue_draw_rows(self, frame, start, end):
+        """Invalidate only the on-screen band showing frame rows [start, end)."""
+        area = self.drawing_area
+        height, width = frame.shape[:2]
+        rect = CairoSurfaceHandler.target_rows_rect(
+            width, height, area.get_allocated_width(), area.get_allocated_height(), start, end)
+        if rect is None:
+            area.queue_draw()
+            return
+        if start < end:
+            area.queue_draw_area(*rect)
+        if self.show_metrics:
+            # The overlay text changes with every frame
+            area.queue_draw_area(*_METRICS_OVERLAY_RECT)
+
+    def _free_frame_buffer(self, shape):
+        """Return an output buffer that is neither on screen nor pending.
+        
+        The buffers are reallocated when the camera resolution changes.
+        """
+        buffers = self._frame_buffers
+        if buffers is None or buffers[0].shape[:2] != shape:
+            buffers = tuple(np.empty(shape + (4,), dtype=np.uint8) for _ in range(3))
+            self._frame_buffers = buffers
+            if not _GTK4:
+                # GTK4 shows textures, so only GTK3 draws from these
+                self._frame_surfaces = {
+                    id(buf): CairoSurfaceHandler.wrap_frame_buffer(buf, opaque=True)
+                    for buf in buffers
+                }
+                self._row_diff = np.empty(shape, dtype=bool)
+                self._dirty_rows = np.empty(shape[0], dtype=bool)
+        with self._frame_lock:
+            in_use = (self.current_frame, self._pending_frame)
+        for buf in buffers:
+            if not any(buf is used for used in in_use):
+                return buf
 
     def draw_frame(self, area, ctx, width, height):
         if self.current_frame is None:
             return
 
         try:
-            surface = CairoSurfaceHandler.create_surface_from_frame(self.current_frame)
+            # Frames from the capture buffers already have a surface over them
+            surface = self._current_surface
+            if surface is None:
+                surface = CairoSurfaceHandler.create_surface_from_frame(self.current_frame)
             CairoSurfaceHandler.scale_and_center(ctx, surface, width, height)
             
             if self.show_metrics:
@@ -190,65 +524,148 @@ class ThermalWindow(Gtk.ApplicationWindow):
             logger.error(f"Error drawing frame: {e}")
             return False
 
+    def draw_overlay(self, area, ctx, width, height):
+        """Draw func of the GTK4 overlay area; frames are shown by the picture."""
+        if self.show_metrics and self.current_frame is not None:
+            self.draw_metrics_overlay(ctx, width, height)
+
     def draw_frame_gtk3(self, widget, ctx):
         return self.draw_frame(widget, ctx, widget.get_allocated_width(), 
                              widget.get_allocated_height())
 
     def draw_metrics_overlay(self, ctx, width, height):
-        """Draw performance metrics overlay."""
+        """Draw performance metrics overlay.
+        
+        The overlay is rendered off-screen and only the values that changed
+        are redrawn; each frame just blits the cached surface.
+        """
         metrics = self.live_view.get_metrics()
+        values = (
+            f"{metrics.fps:.1f}",
+            f"{metrics.frame_time*1000:.1f}ms",
+            f"{metrics.dropped_frames}",
+            f"{metrics.buffer_usage*100:.0f}%",
+        )
         
-        # Setup overlay style
+        if self._metrics_surface is None:
+            self._render_metrics_labels()
+            self._metrics_key = (None,) * len(values)
+        if values != self._metrics_key:
+            self._render_metrics_values(values)
+            self._metrics_key = values
+            
         ctx.save()
-        ctx.set_source_rgba(0, 0, 0, 0.7)  # Semi-transparent black background
-        ctx.rectangle(10, 10, 200, 90)
-        ctx.fill()
+        x, y, _, _ = _METRICS_OVERLAY_RECT
+        ctx.set_source_surface(self._metrics_surface, x, y)
+        ctx.paint()
+        ctx.restore()
+
+    @staticmethod
+    def _metrics_context(surface):
+        """Return a context on surface set up for white metrics text."""
+        overlay = cairo.Context(surface)
+        overlay.set_source_rgb(1, 1, 1)  # White text
+        overlay.select_font_face("monospace")
+        overlay.set_font_size(14)
+        return overlay
+
+    def _render_metrics_labels(self):
+        """Render the metrics box and labels, without values, off-screen."""
+        # Explicit image surfaces: on GTK4 the draw target is a recording
+        # surface, and similar surfaces would record and replay every update
+        _, _, width, height = _METRICS_OVERLAY_RECT
+        labels = cairo.ImageSurface(cairo.FORMAT_ARGB32, width, height)
+        overlay = cairo.Context(labels)
+        overlay.set_source_rgba(0, 0, 0, 0.7)  # Semi-transparent black background
+        overlay.paint()
         
-        ctx.set_source_rgb(1, 1, 1)  # White text
-        ctx.select_font_face("monospace")
-        ctx.set_font_size(14)
+        overlay = self._metrics_context(labels)
+        value_x = []
+        y = _METRICS_LINE_HEIGHT
+        for label in _METRICS_LABELS:
+            overlay.move_to(10, y)
+            overlay.show_text(label)
+            value_x.append(overlay.get_current_point()[0])
+            y += _METRICS_LINE_HEIGHT
+        labels.flush()
         
-        # Draw metrics
-        y = 30
-        for label, value in [
-            ("FPS", f"{metrics.fps:.1f}"),
-            ("Frame Time", f"{metrics.frame_time*1000:.1f}ms"),
-            ("Dropped Frames", str(metrics.dropped_frames)),
-            ("Buffer Usage", f"{metrics.buffer_usage*100:.0f}%")
-        ]:
-            ctx.move_to(20, y)
-            ctx.show_text(f"{label}: {value}")
-            y += 20
-            
-        ctx.restore()
+        surface = cairo.ImageSurface(cairo.FORMAT_ARGB32, width, height)
+        overlay = cairo.Context(surface)
+        overlay.set_source_surface(labels, 0, 0)
+        overlay.paint()
+        self._metrics_labels = labels
+        self._metrics_value_x = tuple(value_x)
+        self._metrics_surface = surface
+
+    def _render_metrics_values(self, values):
+        """Redraw the values that differ from the ones on the overlay."""
+        _, _, width, _ = _METRICS_OVERLAY_RECT
+        overlay = self._metrics_context(self._metrics_surface)
+        line_height = _METRICS_LINE_HEIGHT
+        for row, (value, shown) in enumerate(zip(values, self._metrics_key)):
+            if value == shown:
+                continue
+            # Restore the label background over this value's line, then draw
+            x = self._metrics_value_x[row]
+            baseline = (row + 1) * line_height
+            overlay.set_operator(cairo.OPERATOR_SOURCE)
+            overlay.set_source_surface(self._metrics_labels, 0, 0)
+            overlay.rectangle(x, baseline - line_height + 5, width - x, line_height)
+            overlay.fill()
+            overlay.set_operator(cairo.OPERATOR_OVER)
+            overlay.set_source_rgb(1, 1, 1)
+            overlay.move_to(x, baseline)
+            overlay.show_text(value)
+        self._metrics_surface.flush()
 
     def capture_image(self, button):
         if self.current_frame is not None:
-            timestamp = datetime.now().strftime("%Y%m%d_%H%M%S")
+            timestamp = format_capture_timestamp(time.time())
+            # The color conversion doubles as the snapshot, since the frame
+            # buffer is reused by the capture thread
+            bgr = cv2.cvtColor(self.current_frame, cv2.COLOR_BGRA2BGR)
+            self._io_pool.submit(self._write_capture, bgr, timestamp)
+
+    def _resolve_capture_dir(self):
+        """Return the capture directory, creating the fallback if needed.
+        
+        Resolved once and reused until a write fails; only called on the
+        I/O thread.
+        """
+        capture_dir = self._capture_dir
+        if capture_dir is None:
             capture_dir = Path("/mnt/thermal_storage/thermal_captures")
             if not capture_dir.exists():
                 capture_dir = Path.home() / "thermal_captures"
                 capture_dir.mkdir(exist_ok=True)
-            
-            filepath = capture_dir / f"thermal_{timestamp}.jpg"
-            try:
-                cv2.imwrite(str(filepath),
-                           cv2.cvtColor(self.current_frame, cv2.COLOR_RGB2BGR))
-                logger.info(f"Captured: {filepath}")
-            except Exception as e:
-                logger.error(f"Error saving capture: {e}")
+            self._capture_dir = capture_dir
+        return capture_dir
+
+    def _write_capture(self, bgr, timestamp):
+        """Save a capture to disk; runs on the I/O thread."""
+        try:
+            filepath = self._resolve_capture_dir() / f"thermal_{timestamp}.jpg"
+            if self._jpeg_encoder is not None:
+                data = self._jpeg_encoder.encode(
+                    bgr, quality=_JPEG_QUALITY, pixel_format=TJPF_BGR, flags=TJFLAG_FASTDCT)
+            else:
+                ok, data = cv2.imencode(
+                    ".jpg", bgr, [cv2.IMWRITE_JPEG_QUALITY, _JPEG_QUALITY, cv2.IMWRITE_JPEG_OPTIMIZE, 0])
+                if not ok:
+                    raise RuntimeError("JPEG encoding failed")
+            filepath.write_bytes(data)
+            logger.info(f"Captured: {filepath}")
+        except Exception as e:
+            # The storage may have gone away; check it again next time
+            self._capture_dir = None
+            logger.error(f"Error saving capture: {e}")
 
     def change_palette(self, dropdown, *args):
-        palette_map = {
-            0: cv2.COLORMAP_HOT,    # Iron
-            1: cv2.COLORMAP_JET,    # Rainbow
-            2: cv2.COLORMAP_BONE    # Gray
-        }
-        if Gtk._version.startswith('4'):
-            selected = dropdown.get_selected()
-        else:
-            selected = dropdown.get_active()
-        self.current_palette = palette_map[selected]
+        selected = self._get_palette_index(dropdown)
+        if not 0 <= selected < len(_PALETTES):
+            return  # Nothing selected
+        self.current_palette = _PALETTES[selected]
+        self._palette_lut = _PALETTE_LUTS[selected]
         logger.debug(f"Palette changed to: {selected}")
 
     def toggle_metrics(self, button):
@@ -258,9 +675,24 @@ class ThermalWindow(Gtk.ApplicationWindow):
         logger.debug(f"Metrics display toggled: {self.show_metrics}")
 
     def do_close_request(self):
-        """Clean up resources when window is closed."""
+        """Clean up resources when window is closed.
+        
+        The capture thread is stopped before the camera is released so no
+        read is in flight on a released device.
+        """
+        if self._stop_capture.is_set():
+            return False
+        self._stop_capture.set()
+        self._capture_thread.join(timeout=1.0)
+        # Stop picking up frames; the id is tracked so the callback is removed
+        # even if the widget outlives the window
+        if self._tick_id:
+            self.drawing_area.remove_tick_callback(self._tick_id)
+            self._tick_id = 0
         if self.cap is not None:
             self.cap.release()
+        # Captures already queued are still written
+        self._io_pool.shutdown(wait=False)
         self.live_view.clear_buffer()
         logger.info("Window resources cleaned up")
         return False
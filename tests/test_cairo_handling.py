@@ -18,11 +18,11 @@ def test_surface_creation_with_camera_frame(rgb_frame):
     # Test creating surface from a frame similar to what the camera produces
     try:
         surface = CairoSurfaceHandler.create_surface_from_frame(rgb_frame)
-        assert isinstance(surface.surface, cairo.ImageSurface)
+        assert isinstance(surface, cairo.ImageSurface)
         assert surface.get_width() == 256
         assert surface.get_height() == 192
         # Check if the surface is writable
-        ctx = cairo.Context(surface.surface)
+        ctx = cairo.Context(surface)
         ctx.set_source_rgb(1.0, 0.0, 0.0)
         ctx.rectangle(0, 0, 10, 10)
         ctx.fill()
@@ -44,7 +44,7 @@ def test_frame_data_lifetime():
     gc.collect()
     
     # Try to write to the surface
-    ctx = cairo.Context(surface.surface)
+    ctx = cairo.Context(surface)
     ctx.set_source_rgb(1.0, 0.0, 0.0)
     ctx.paint()
     
@@ -63,7 +63,7 @@ def test_frame_memory_alignment():
     
     # This should work without errors
     surface = CairoSurfaceHandler.create_surface_from_frame(frame)
-    assert isinstance(surface.surface, cairo.ImageSurface)
+    assert isinstance(surface, cairo.ImageSurface)
 
 def test_cairo_write_access():
     # Create a frame
@@ -74,7 +74,7 @@ def test_cairo_write_access():
     surface = CairoSurfaceHandler.create_surface_from_frame(frame)
     
     # Attempt to write to it
-    ctx = cairo.Context(surface.surface)
+    ctx = cairo.Context(surface)
     ctx.set_source_rgb(1.0, 0.0, 0.0)
     ctx.rectangle(0, 0, 50, 50)
     try:
@@ -111,21 +111,17 @@ def test_alpha_channel_handling(rgb_frame):
     # Check that alpha channel is set to 255 (fully opaque)
     assert np.all(surface_array[:, :, 3] == 255), "Alpha channel should be 255"
 
-def test_memory_cleanup():
+def test_surface_keeps_buffer_alive():
     frame = np.zeros((192, 256, 3), dtype=np.uint8)
     surface = CairoSurfaceHandler.create_surface_from_frame(frame)
-    surface_id = surface.surface_id
     
-    # Verify the reference is stored
-    assert surface_id in CairoSurfaceHandler._data_refs
-    
-    # Delete the surface and force garbage collection
-    del surface
+    # Drop every other reference and make sure the pixel data is still valid
+    del frame
     import gc
     gc.collect()
     
-    # Verify the reference is cleaned up
-    assert surface_id not in CairoSurfaceHandler._data_refs
+    surface_array = np.frombuffer(surface.get_data(), dtype=np.uint8)
+    assert np.all(surface_array.reshape(192, 256, 4)[:, :, 3] == 255)
 
 def test_scale_and_center():
     # Create a test surface
@@ -142,6 +138,18 @@ def test_scale_and_center():
     # Test with None surface (should not raise any exceptions)
     CairoSurfaceHandler.scale_and_center(ctx, None, 400, 300)
 
+def test_scale_and_center_same_size():
+    frame = np.zeros((100, 200, 3), dtype=np.uint8)
+    surface = CairoSurfaceHandler.create_surface_from_frame(frame)
+    target_surface = cairo.ImageSurface(cairo.FORMAT_ARGB32, 200, 100)
+    ctx = cairo.Context(target_surface)
+    
+    # Matching sizes take the untransformed path, leaving the caller's
+    # source in place
+    ctx.set_source_rgb(1, 0, 0)
+    CairoSurfaceHandler.scale_and_center(ctx, surface, 200, 100)
+    assert isinstance(ctx.get_source(), cairo.SolidPattern)
+
 def test_scale_and_center_smaller_target():
     # Create a test surface
     frame = np.zeros((400, 600, 3), dtype=np.uint8)
@@ -184,3 +192,108 @@ def test_scale_and_center_invalid_matrix():
     CairoSurfaceHandler.scale_and_center(ctx, surface, 400, float('inf'))
     CairoSurfaceHandler.scale_and_center(ctx, surface, float('nan'), 300)
     CairoSurfaceHandler.scale_and_center(ctx, surface, 400, float('nan'))
+
+def test_surface_buffer_reuse():
+    CairoSurfaceHandler._surface_rings.pop((120, 160), None)
+    frame = np.zeros((120, 160, 3), dtype=np.uint8)
+    surface_ids = [
+        id(CairoSurfaceHandler.create_surface_from_frame(frame))
+        for _ in range(CairoSurfaceHandler._RING_SIZE)
+    ]
+    
+    # Once the ring is full the oldest unheld surface is reused for the next frame
+    frame[:] = 255
+    surface = CairoSurfaceHandler.create_surface_from_frame(frame)
+    assert id(surface) == surface_ids[0]
+    surface_array = np.frombuffer(surface.get_data(), dtype=np.uint8)
+    assert np.all(surface_array == 255)
+
+def test_held_surface_keeps_pixels():
+    frame = np.full((120, 160, 3), 50, dtype=np.uint8)
+    held = CairoSurfaceHandler.create_surface_from_frame(frame)
+    
+    # A surface the caller still holds is never handed out again
+    frame[:] = 255
+    for _ in range(CairoSurfaceHandler._RING_SIZE):
+        surface = CairoSurfaceHandler.create_surface_from_frame(frame)
+        assert surface is not held
+    held_array = np.frombuffer(held.get_data(), dtype=np.uint8).reshape(120, 160, 4)
+    assert np.all(held_array[:, :, :3] == 50)
+
+def test_alpha_channel_on_reused_buffers(rgb_frame):
+    # Reused ring buffers must come back fully opaque without a separate alpha pass
+    for _ in range(CairoSurfaceHandler._RING_SIZE + 1):
+        surface = CairoSurfaceHandler.create_surface_from_frame(rgb_frame)
+    surface_array = np.frombuffer(surface.get_data(), dtype=np.uint8).reshape(192, 256, 4)
+    assert np.all(surface_array[:, :, 3] == 255)
+
+def test_bgra_frame_passthrough():
+    # 4-channel frames are taken as BGRA and copied into the surface unchanged
+    frame = np.zeros((192, 256, 4), dtype=np.uint8)
+    frame[:, :, 0] = 10
+    frame[:, :, 1] = 20
+    frame[:, :, 2] = 30
+    frame[:, :, 3] = 255
+    surface = CairoSurfaceHandler.create_surface_from_frame(frame)
+    surface_array = np.frombuffer(surface.get_data(), dtype=np.uint8).reshape(192, 256, 4)
+    assert np.array_equal(surface_array, frame)
+
+def test_wrap_frame_buffer():
+    buf = np.zeros((192, 256, 4), dtype=np.uint8)
+    surface = CairoSurfaceHandler.wrap_frame_buffer(buf)
+    assert surface.get_width() == 256
+    assert surface.get_height() == 192
+    
+    # The surface reads straight from the buffer, no copy involved
+    buf[:] = 200
+    surface.mark_dirty()
+    surface_array = np.frombuffer(surface.get_data(), dtype=np.uint8)
+    assert np.all(surface_array == 200)
+    assert surface.get_format() == cairo.FORMAT_ARGB32
+    
+    opaque_surface = CairoSurfaceHandler.wrap_frame_buffer(buf, opaque=True)
+    assert opaque_surface.get_format() == cairo.FORMAT_RGB24
+    
+    with pytest.raises(ValueError):
+        CairoSurfaceHandler.wrap_frame_buffer(np.zeros((192, 256, 3), dtype=np.uint8))
+
+def test_scale_and_center_upscale_uses_nearest_filter():
+    # A black and a white pixel enlarged 4x must stay hard-edged
+    frame = np.zeros((1, 2, 3), dtype=np.uint8)
+    frame[0, 1] = 255
+    surface = CairoSurfaceHandler.create_surface_from_frame(frame)
+    target_surface = cairo.ImageSurface(cairo.FORMAT_ARGB32, 8, 4)
+    ctx = cairo.Context(target_surface)
+    
+    CairoSurfaceHandler.scale_and_center(ctx, surface, 8, 4)
+    target_surface.flush()
+    
+    stride = target_surface.get_stride()
+    pixels = np.frombuffer(target_surface.get_data(), dtype=np.uint8)
+    pixels = pixels.reshape(4, stride // 4, 4)[:, :8, :3]
+    assert np.all(pixels[:, :4] == 0)
+    assert np.all(pixels[:, 4:] == 255)
+
+def test_scale_and_center_layout_cached():
+    layout = CairoSurfaceHandler._fit_layout(256, 192, 800, 600)
+    assert layout is not None
+    assert CairoSurfaceHandler._fit_layout(256, 192, 800, 600) is layout
+    
+    # A new drawing area size gets a fresh layout
+    resized = CairoSurfaceHandler._fit_layout(256, 192, 1024, 768)
+    assert resized is not layout
+    assert resized[1] == 4.0
+    
+    # Invalid sizes have no layout
+    assert CairoSurfaceHandler._fit_layout(256, 192, float('inf'), 600) is None
+
+def test_target_rows_rect():
+    # 256x192 shown at 4x in a 1024x868 area: 50px vertical centering offset
+    rect = CairoSurfaceHandler.target_rows_rect(256, 192, 1024, 868, 10, 20)
+    assert rect == (0, 89, 1024, 42)
+    
+    # Bands are clamped to the target area
+    x, y, w, h = CairoSurfaceHandler.target_rows_rect(256, 192, 1024, 768, 0, 192)
+    assert (y, h) == (0, 768)
+    
+    assert CairoSurfaceHandler.target_rows_rect(256, 192, 0, 768, 0, 10) is None
@@ -21,3 +21,51 @@ def test_mock_camera(mock_camera):
     
     cap.release()
     assert not cap.is_open
+
+def test_mock_thermal_camera_grayscale():
+    from thermal2pro.camera.mock_camera import MockThermalCamera
+    cap = MockThermalCamera(grayscale=True)
+    ret, frame = cap.read()
+    assert ret
+    assert frame.shape == (192, 256)
+    assert frame.dtype == np.uint8
+    assert frame.max() == 255  # Hot spot is full intensity
+    assert not frame.flags.writeable
+    cap.release()
+
+def test_mock_thermal_camera_numpy_fallback(monkeypatch):
+    from thermal2pro.camera import mock_camera
+    monkeypatch.setattr(mock_camera, '_synthesize_pattern', None)
+    cap = mock_camera.MockThermalCamera()
+    ret, frame = cap.read()
+    assert ret
+    assert frame.shape == (192, 256, 3)
+    cap.release()
+
+def test_mock_thermal_camera_read_into_buffer():
+    from thermal2pro.camera.mock_camera import MockThermalCamera
+    cap = MockThermalCamera()
+    buf = np.zeros((192, 256, 3), dtype=np.uint8)
+    ret, frame = cap.read(buf)
+    assert ret
+    assert frame is buf
+    assert frame.flags.writeable
+    assert frame.any()
+    
+    # Passing a returned internal frame back keeps the normal double buffering
+    _, internal = cap.read()
+    _, frame = cap.read(internal)
+    assert frame is not internal
+    cap.release()
+
+def test_mock_thermal_camera_grab_retrieve():
+    from thermal2pro.camera.mock_camera import MockThermalCamera
+    cap = MockThermalCamera()
+    assert cap.grab()
+    ret, frame = cap.retrieve()
+    assert ret
+    assert frame.shape == (192, 256, 3)
+    
+    cap.release()
+    assert not cap.grab()
+    assert cap.retrieve() == (False, None)
@@ -1,7 +1,8 @@
 import pytest
 import numpy as np
 import cv2
-from thermal2pro.camera.processing import ThermalProcessor
+from thermal2pro.camera import processing
+from thermal2pro.camera.processing import RawNormalizer, ThermalProcessor, apply_lut, build_bgra_lut
 
 @pytest.fixture
 def thermal_processor():
@@ -31,6 +32,37 @@ def test_color_palette_switching(thermal_processor, sample_frame):
     assert gray.shape == (192, 256, 3)
     assert len(np.unique(gray[:, 0])) == 1  # Each column should be same color
 
+def test_palette_lut_matches_colormap(thermal_processor, sample_frame):
+    for name, colormap in ThermalProcessor.PALETTE_MAP.items():
+        expected = cv2.cvtColor(cv2.applyColorMap(sample_frame, colormap), cv2.COLOR_BGR2RGB)
+        np.testing.assert_array_equal(thermal_processor.apply_palette(sample_frame, name), expected)
+
+def test_bgra_lut_matches_colormap(sample_frame):
+    for colormap in ThermalProcessor.PALETTE_MAP.values():
+        expected = cv2.cvtColor(cv2.applyColorMap(sample_frame, colormap), cv2.COLOR_BGR2BGRA)
+        np.testing.assert_array_equal(build_bgra_lut(colormap)[sample_frame], expected)
+
+@pytest.mark.parametrize("use_jit", [True, False])
+def test_apply_lut_matches_indexing(monkeypatch, sample_frame, use_jit):
+    if not use_jit:
+        monkeypatch.setattr(processing, '_gather_lut', None)
+        monkeypatch.setattr(processing, '_gather_words', None)
+    lut = build_bgra_lut(cv2.COLORMAP_JET)
+    out = np.empty(sample_frame.shape + (4,), dtype=np.uint8)
+    assert apply_lut(sample_frame, lut, out) is out
+    np.testing.assert_array_equal(out, lut[sample_frame])
+    
+    # 3-channel tables are gathered per channel
+    rgb_lut = np.ascontiguousarray(lut[:, :3])
+    rgb_out = np.empty(sample_frame.shape + (3,), dtype=np.uint8)
+    apply_lut(sample_frame, rgb_lut, rgb_out)
+    np.testing.assert_array_equal(rgb_out, rgb_lut[sample_frame])
+    
+    # Strided single-plane views of a 3-channel frame work as well
+    bgr = cv2.cvtColor(sample_frame, cv2.COLOR_GRAY2BGR)
+    apply_lut(bgr[:, :, 0], lut, out)
+    np.testing.assert_array_equal(out, lut[sample_frame])
+
 def test_frame_scaling(thermal_processor, sample_frame):
     # Test upscaling
     scaled_up = thermal_processor.scale_frame(sample_frame, 512, 384)
@@ -43,15 +75,26 @@ def test_frame_scaling(thermal_processor, sample_frame):
     # Test aspect ratio preservation
     scaled_ratio = thermal_processor.scale_frame(sample_frame, 512, 512)
     assert scaled_ratio.shape[1] / scaled_ratio.shape[0] == 256 / 192
+    
+    # Test no-op resize returns the input frame
+    assert thermal_processor.scale_frame(sample_frame, 256, 192) is sample_frame
 
 def test_temperature_range_mapping(thermal_processor, sample_frame):
     # Test temperature range mapping
     min_temp, max_temp = 20.0, 40.0  # Celsius
     temp_mapped = thermal_processor.map_temperature_range(sample_frame, min_temp, max_temp)
+    assert temp_mapped.dtype == np.uint8
+    np.testing.assert_array_equal(temp_mapped, sample_frame)
     
     # Check that 0 maps to min_temp and 255 maps to max_temp
     assert np.isclose(thermal_processor.raw_to_temperature(0, min_temp, max_temp), min_temp)
     assert np.isclose(thermal_processor.raw_to_temperature(255, min_temp, max_temp), max_temp)
+    
+    # Array conversion runs in float32
+    temps = thermal_processor.raw_to_temperature(sample_frame, min_temp, max_temp)
+    assert temps.dtype == np.float32
+    assert np.isclose(temps[0, 0], min_temp)
+    assert np.isclose(temps[0, -1], max_temp)
 
 def test_frame_preprocessing(thermal_processor, sample_frame):
     # Test noise reduction
@@ -62,6 +105,12 @@ def test_frame_preprocessing(thermal_processor, sample_frame):
     # Test that noise reduction smooths the image
     assert np.mean(np.abs(np.diff(denoised))) < np.mean(np.abs(np.diff(sample_frame)))
 
+def test_frame_preprocessing_quality_path(sample_frame):
+    processor = ThermalProcessor(fast_denoise=False)
+    denoised = processor.preprocess_frame(sample_frame)
+    assert denoised.shape == sample_frame.shape
+    assert denoised.dtype == sample_frame.dtype
+
 def test_invalid_palette_handling(thermal_processor, sample_frame):
     with pytest.raises(ValueError):
         thermal_processor.apply_palette(sample_frame, 'invalid_palette')
@@ -72,3 +121,31 @@ def test_invalid_frame_handling(thermal_processor):
     
     with pytest.raises(ValueError):
         thermal_processor.preprocess_frame(np.zeros((10, 10, 3)))  # Wrong shape
+
+def test_raw_normalizer():
+    normalizer = RawNormalizer()
+    raw = np.tile(np.linspace(1000, 5000, 256).astype(np.uint16), (192, 1))
+    gray = normalizer(raw)
+    assert gray.dtype == np.uint8
+    assert gray.shape == raw.shape
+    assert gray[0, 0] == 0
+    assert gray[0, -1] == 255
+    assert np.all(np.diff(gray[0].astype(int)) >= 0)
+    
+    # A steady scene reuses the table and writes into a given buffer
+    out = np.empty_like(gray)
+    assert normalizer(raw, out=out) is out
+    np.testing.assert_array_equal(out, gray)
+    
+    with pytest.raises(ValueError):
+        normalizer(gray)
+
+def test_apply_lut_fused_raw_table():
+    # A normalizer table composed with a palette colorizes 16-bit frames in one pass
+    normalizer = RawNormalizer()
+    raw = np.tile(np.linspace(1000, 5000, 256).astype(np.uint16), (192, 1))
+    normalizer.update(raw)
+    palette = build_bgra_lut(cv2.COLORMAP_JET)
+    out = np.empty(raw.shape + (4,), dtype=np.uint8)
+    apply_lut(raw, palette[normalizer.lut], out)
+    np.testing.assert_array_equal(out, palette[normalizer(raw)])
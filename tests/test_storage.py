@@ -6,6 +6,7 @@ import shutil
 from datetime import datetime, timedelta
 import time
 from unittest.mock import mock_open, patch
+from thermal2pro.storage import handler
 from thermal2pro.storage.handler import StorageHandler
 
 @pytest.fixture
@@ -120,6 +121,38 @@ def test_cleanup_old_captures(storage_handler):
     assert not old_file.exists()
     assert new_file.exists()
 
+def fake_storage_info(free_gb_values):
+    """Return a get_storage_info replacement reporting the given free space in turn."""
+    values = iter(free_gb_values)
+    def storage_info():
+        return {"free_gb": next(values)}
+    return storage_info
+
+def test_cleanup_deletes_stale_captures_when_low_on_space(storage_handler, monkeypatch):
+    """Test the deletion path with free space forced below the minimum."""
+    storage_path = Path(storage_handler.get_storage_path())
+    old_files = [create_test_capture(storage_path, days) for days in (10, 20)]
+    new_file = create_test_capture(storage_path, 2)
+    monkeypatch.setattr(storage_handler, 'get_storage_info', fake_storage_info([0]))
+    
+    result = storage_handler.cleanup_old_captures()
+    assert result == {"deleted": 2, "freed_space": 2}
+    assert not any(f.exists() for f in old_files)
+    assert new_file.exists()
+
+def test_cleanup_stops_oldest_first_once_space_recovered(storage_handler, monkeypatch):
+    """Test that cleanup removes the oldest capture first and stops when space is back."""
+    storage_path = Path(storage_handler.get_storage_path())
+    newer = create_test_capture(storage_path, 10)
+    oldest = create_test_capture(storage_path, 20)
+    monkeypatch.setattr(handler, 'SPACE_RECHECK_BYTES', 1)
+    monkeypatch.setattr(storage_handler, 'get_storage_info', fake_storage_info([0, 5]))
+    
+    result = storage_handler.cleanup_old_captures()
+    assert result["deleted"] == 1
+    assert not oldest.exists()
+    assert newer.exists()
+
 def test_monitor_storage(storage_handler):
     storage_path = Path(storage_handler.get_storage_path())
     # Create some test captures
@@ -131,3 +164,83 @@ def test_monitor_storage(storage_handler):
     assert "storage_info" in status
     assert "captures" in status
     assert status["captures"] == 3
+
+def test_storage_path_cached(storage_handler, monkeypatch):
+    """Test that storage path resolution is cached until invalidated."""
+    calls = []
+    def fake_mounted():
+        calls.append(1)
+        return False
+    monkeypatch.setattr(storage_handler, '_is_usb_mounted', fake_mounted)
+    
+    assert storage_handler.get_storage_path() == storage_handler.fallback_storage
+    assert storage_handler.get_storage_path() == storage_handler.fallback_storage
+    assert len(calls) == 1
+    
+    storage_handler.invalidate_storage_path()
+    storage_handler.get_storage_path()
+    assert len(calls) == 2
+
+def test_list_captures_cache_invalidation(storage_handler):
+    """Test that cached listings pick up new captures."""
+    storage_path = Path(storage_handler.get_storage_path())
+    create_test_capture(storage_path, 1)
+    assert len(storage_handler.list_captures()) == 1
+    
+    create_test_capture(storage_path, 3)
+    assert len(storage_handler.list_captures()) == 2
+    
+    # A write that leaves the directory mtime unchanged, as on filesystems
+    # with coarse timestamps, is still picked up
+    dir_mtime = os.stat(storage_path).st_mtime_ns
+    create_test_capture(storage_path, 5)
+    os.utime(storage_path, ns=(dir_mtime, dir_mtime))
+    assert len(storage_handler.list_captures()) == 3
+
+def test_list_captures_cache_reused_for_settled_directory(storage_handler, monkeypatch):
+    """Test that listings are reused once the directory mtime is old enough."""
+    storage_path = Path(storage_handler.get_storage_path())
+    create_test_capture(storage_path, 1)
+    settled = time.time_ns() - 60 * 10**9
+    os.utime(storage_path, ns=(settled, settled))
+    assert len(storage_handler.list_captures()) == 1
+    
+    scans = []
+    real_scandir = os.scandir
+    monkeypatch.setattr(os, 'scandir', lambda path: scans.append(path) or real_scandir(path))
+    assert len(storage_handler.list_captures()) == 1
+    assert not scans
+
+def test_list_captures_skips_malformed_names(storage_handler):
+    """Test that files with invalid timestamps are ignored."""
+    storage_path = Path(storage_handler.get_storage_path())
+    create_test_capture(storage_path, 1)
+    (storage_path / "thermal_20241301_120000.jpg").write_bytes(b"0")
+    (storage_path / "thermal_latest.jpg").write_bytes(b"0")
+    
+    captures = storage_handler.list_captures()
+    assert len(captures) == 1
+
+def test_storage_path_invalidated_on_error(storage_handler, monkeypatch):
+    """Test that a failing storage location drops the cached path."""
+    storage_handler.get_storage_path()
+    
+    def failing_disk_usage(path):
+        raise OSError("device removed")
+    monkeypatch.setattr(shutil, 'disk_usage', failing_disk_usage)
+    
+    assert storage_handler.get_storage_info() is None
+    assert storage_handler._storage_path_cache is None
+
+def test_format_capture_timestamp_round_trip():
+    """Test that formatted capture timestamps parse back to the same local time."""
+    now = time.time()
+    timestamp = handler.format_capture_timestamp(now)
+    assert handler._parse_capture_timestamp(timestamp) == datetime.fromtimestamp(int(now))
+
+def test_format_capture_timestamp_matches_strftime():
+    """Test that the f-string formatter matches strftime with the capture format."""
+    now = time.time()
+    for seconds in (0, 86399, 951782400, now, now + 3600 * 24 * 200):
+        assert handler.format_capture_timestamp(seconds) == time.strftime(
+            handler.CAPTURE_TIMESTAMP_FORMAT, time.localtime(seconds))